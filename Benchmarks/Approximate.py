@@ -0,0 +1,80 @@
+"""
+Качество и скорость приближённого графа MinHash/LSH по сравнению с точным.
+Для каждого размера документа и набора параметров LSH замеряет время
+summarize, число рёбер и согласие ранжирования с точным графом.
+
+Запуск из корня репозитория:
+    python -m Benchmarks.Approximate --sizes 1000 5000 --settings 16:2:32 32:2:32 32:2:64
+"""
+
+import argparse
+import json
+import sys
+from time import perf_counter
+
+from TextRank import Summarizer
+from TextRank.MinHash import MinHashLSH
+from TextRank.Stats import SummaryStats
+from .Benchmark import ranking_agreement
+from .Documents import DOCUMENT_KINDS, SAMPLES, build_document
+
+DEFAULT_SIZES = (1000, 5000)
+DEFAULT_SETTINGS = ("16:2:16", "16:2:32", "32:2:32", "32:2:64", "32:1:32")
+
+# Точный граф больших документов не помещается в память.
+EXACT_SIZE_LIMIT = 10000
+
+
+def parse_setting(setting):
+    """Разбирает строку bands:rows:max_bucket_size."""
+    bands, rows, max_bucket_size = (int(value) for value in setting.split(":"))
+    return MinHashLSH(bands, rows, max_bucket_size)
+
+
+def run(text, language, **options):
+    """Резюме со всеми предложениями и оценками; options передаются в summarize."""
+    stats = SummaryStats()
+    start = perf_counter()
+    result = Summarizer.summarize(text, language, ratio=1.0, scores=True, stats=stats, **options)
+    return perf_counter() - start, stats, result
+
+
+def run_benchmark(language, kind, sizes, settings, seed=0, log=None):
+    results = []
+    for size in sizes:
+        text = build_document(kind, language, size, seed)
+        exact = run(text, language) if size <= EXACT_SIZE_LIMIT else None
+        if exact is not None:
+            results.append({"size": size, "setting": "exact", "seconds": exact[0], "edges": exact[1].edges})
+
+        for setting in settings:
+            seconds, stats, result = run(text, language, lsh=parse_setting(setting))
+            record = {"size": size, "setting": setting, "seconds": seconds, "edges": stats.edges}
+            if exact is not None:
+                record["edge_fraction"] = stats.edges / exact[1].edges if exact[1].edges else None
+                record["speedup"] = exact[0] / seconds
+                record["agreement"] = ranking_agreement(result, exact[2])
+            results.append(record)
+            if log is not None:
+                log("%d %s: %.3f s, %d edges" % (size, setting, seconds, stats.edges))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MinHash/LSH approximate graph versus the exact graph")
+    parser.add_argument("--language", default="english", choices=sorted(SAMPLES))
+    parser.add_argument("--kind", default="synthetic", choices=sorted(DOCUMENT_KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--settings", nargs="+", default=list(DEFAULT_SETTINGS),
+                        help="LSH parameters as bands:rows:max_bucket_size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_benchmark(args.language, args.kind, args.sizes, args.settings, args.seed, log)
+    json.dump({"parameters": vars(args), "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
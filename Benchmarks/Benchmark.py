@@ -0,0 +1,163 @@
+"""
+Воспроизводимый замер производительности TextRank.
+Для каждого языка, вида документа и размера замеряет этапы Summarizer.summarize
+для всех движков PageRank, пиковую память и согласие ранжирования с эталонным
+движком. Результаты записываются в JSON, чтобы запуски можно было сравнивать.
+
+Запуск из корня репозитория:
+    python -m Benchmarks.Benchmark --sizes 10 100 1000 --output benchmark.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from time import perf_counter
+
+import numpy
+import scipy
+from scipy.stats import spearmanr
+
+from TextRank import Summarizer
+from TextRank.PageRankWeighted import PAGERANK_ENGINES
+from TextRank.Stats import SummaryStats
+from .Documents import DOCUMENT_KINDS, SAMPLES, build_document
+
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+
+# Движки с плотными или чисто питоновскими вычислениями на больших графах не запускаются.
+ENGINE_SIZE_LIMITS = {
+    "python": 100,
+    "scipy": 3000,
+}
+
+# Эталон для согласия ранжирования; берётся первый движок, запущенный на данном размере.
+REFERENCE_ENGINES = ("scipy", "sparse")
+
+TOP_RATIO = 0.2
+
+
+def _summarize_scores(text, language, engine, stats=None):
+    # ratio=1 возвращает все предложения с оценками в исходном порядке.
+    return Summarizer.summarize(text, language, ratio=1.0, scores=True, engine=engine, stats=stats)
+
+
+def time_engine(text, language, engine, repeat):
+    """Возвращает время всех повторов и статистику самого быстрого из них."""
+    wall_times = []
+    best_stats = None
+    result = None
+    for _ in range(repeat):
+        stats = SummaryStats()
+        start = perf_counter()
+        result = _summarize_scores(text, language, engine, stats)
+        wall_times.append(perf_counter() - start)
+        if best_stats is None or wall_times[-1] == min(wall_times):
+            best_stats = stats
+    return wall_times, best_stats, result
+
+
+def peak_memory(text, language, engine):
+    """Пиковый объём памяти Python и NumPy за один вызов, в байтах."""
+    tracemalloc.start()
+    try:
+        _summarize_scores(text, language, engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def ranking_agreement(result, reference):
+    """Ранговая корреляция Спирмена и доля совпадений среди лучших TOP_RATIO предложений."""
+    scores = [score for _, score in result]
+    reference_scores = [score for _, score in reference]
+    if len(scores) != len(reference_scores) or len(scores) < 2:
+        return {"spearman": None, "top_overlap": None}
+
+    top_count = max(1, int(len(scores) * TOP_RATIO))
+    top = set(numpy.argsort(scores, kind="stable")[::-1][:top_count].tolist())
+    reference_top = set(numpy.argsort(reference_scores, kind="stable")[::-1][:top_count].tolist())
+    correlation = spearmanr(scores, reference_scores).correlation
+    return {
+        "spearman": None if numpy.isnan(correlation) else float(correlation),
+        "top_overlap": len(top & reference_top) / top_count,
+    }
+
+
+def run_benchmark(languages, kinds, sizes, engines, repeat=3, seed=0, memory=True, log=None):
+    results = []
+    for language in languages:
+        for kind in kinds:
+            for size in sizes:
+                text = build_document(kind, language, size, seed)
+                case_results = {}
+                for engine in engines:
+                    if size > ENGINE_SIZE_LIMITS.get(engine, size):
+                        continue
+
+                    wall_times, stats, result = time_engine(text, language, engine, repeat)
+                    case_results[engine] = result
+                    record = {
+                        "language": language,
+                        "kind": kind,
+                        "size": size,
+                        "engine": engine,
+                        "wall_time_min": min(wall_times),
+                        "wall_time_median": statistics.median(wall_times),
+                        "stats": stats.as_dict(),
+                        "peak_memory": peak_memory(text, language, engine) if memory else None,
+                    }
+                    results.append(record)
+                    if log is not None:
+                        log("%s/%s/%d %s: %.4f s" % (language, kind, size, engine, record["wall_time_min"]))
+
+                reference_engine = next((engine for engine in REFERENCE_ENGINES if engine in case_results), None)
+                for record in results:
+                    if (record["language"], record["kind"], record["size"]) != (language, kind, size):
+                        continue
+                    record["reference_engine"] = reference_engine
+                    if reference_engine is not None:
+                        record["agreement"] = ranking_agreement(case_results[record["engine"]],
+                                                                case_results[reference_engine])
+    return results
+
+
+def environment():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "numpy": numpy.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TextRank pipeline benchmark")
+    parser.add_argument("--languages", nargs="+", default=sorted(SAMPLES), choices=sorted(SAMPLES))
+    parser.add_argument("--kinds", nargs="+", default=sorted(DOCUMENT_KINDS), choices=sorted(DOCUMENT_KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="document sizes in sentences (up to 20000)")
+    parser.add_argument("--engines", nargs="+", default=sorted(PAGERANK_ENGINES), choices=sorted(PAGERANK_ENGINES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak memory runs")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_benchmark(args.languages, args.kinds, args.sizes, args.engines, args.repeat, args.seed,
+                            not args.no_memory, log)
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump({"environment": environment(), "parameters": vars(args), "results": results},
+                  output, ensure_ascii=False, indent=2)
+    log("Results written to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
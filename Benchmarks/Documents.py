@@ -0,0 +1,87 @@
+import random
+
+ENGLISH_SAMPLE = """
+The city council approved a new budget for public transport on Tuesday evening.
+Officials said the plan would add more buses to the busiest routes and extend night service.
+Critics argued that ticket prices were already too high for many families.
+The mayor promised that fares would stay the same for at least two more years.
+Several drivers told reporters that staff shortages had caused long delays all winter.
+The transport department expects to hire two hundred new drivers before the summer.
+Local businesses welcomed the decision and hoped more customers would reach the city centre.
+Environmental groups said better public transport was the fastest way to cut traffic and pollution.
+The budget also includes money for repairing old stations and installing new ticket machines.
+A final vote on the detailed spending plan is scheduled for next month.
+"""
+
+RUSSIAN_SAMPLE = """
+Городской совет во вторник вечером утвердил новый бюджет на общественный транспорт.
+Чиновники заявили, что план добавит автобусы на самые загруженные маршруты и продлит ночную работу.
+Критики считают, что цены на билеты и так слишком высоки для многих семей.
+Мэр пообещал, что стоимость проезда не изменится как минимум ещё два года.
+Несколько водителей рассказали журналистам, что из-за нехватки персонала всю зиму были задержки.
+Транспортный департамент рассчитывает нанять двести новых водителей до начала лета.
+Местные предприниматели приветствовали решение и надеются, что в центр города приедет больше покупателей.
+Экологи заявили, что хороший общественный транспорт быстрее всего сокращает пробки и загрязнение.
+Бюджет также предусматривает деньги на ремонт старых станций и установку новых терминалов.
+Окончательное голосование по подробному плану расходов назначено на следующий месяц.
+"""
+
+SAMPLES = {
+    "english": ENGLISH_SAMPLE,
+    "russian": RUSSIAN_SAMPLE,
+}
+
+
+def _sample_sentences(language):
+    return [line.strip() for line in SAMPLES[language].strip().splitlines() if line.strip()]
+
+
+def sample_document(language, sentences_count, seed=0):
+    """
+    Составляет документ из предложений образца: каждое предложение - случайное
+    подмножество слов случайного предложения образца с сохранением порядка,
+    поэтому предложения почти не повторяются, но остаются похожими на настоящие.
+    """
+    rnd = random.Random(seed)
+    sample = [sentence.rstrip(".").split() for sentence in _sample_sentences(language)]
+    sentences = []
+    for _ in range(sentences_count):
+        words = rnd.choice(sample)
+        kept = [word for word in words if rnd.random() < 0.8] or words[:1]
+        sentences.append(" ".join(kept) + ".")
+    return " ".join(sentences)
+
+
+def synthetic_document(language, sentences_count, seed=0, exponent=1.1):
+    """
+    Составляет документ из случайных слов словаря образца, распределённых
+    по закону Ципфа, как в естественном тексте.
+    """
+    rnd = random.Random(seed)
+    vocabulary = sorted({word.strip(".,").lower() for sentence in _sample_sentences(language)
+                         for word in sentence.split()})
+    rnd.shuffle(vocabulary)
+
+    cumulative_weights = []
+    total = 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1.0 / rank ** exponent
+        cumulative_weights.append(total)
+
+    sentences = []
+    for _ in range(sentences_count):
+        words = rnd.choices(vocabulary, cum_weights=cumulative_weights, k=rnd.randint(5, 25))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+DOCUMENT_KINDS = {
+    "sample": sample_document,
+    "synthetic": synthetic_document,
+}
+
+
+def build_document(kind, language, sentences_count, seed=0):
+    if kind not in DOCUMENT_KINDS:
+        raise ValueError("Valid document kinds are: " + ", ".join(sorted(DOCUMENT_KINDS)))
+    return DOCUMENT_KINDS[kind](language, sentences_count, seed)
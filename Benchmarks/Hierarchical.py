@@ -0,0 +1,75 @@
+"""
+Иерархическое резюмирование по сравнению с одним графом на весь документ.
+Для каждого размера документа и размера порции замеряет время и долю
+предложений резюме, совпавших с резюме обычного summarize.
+
+Запуск из корня репозитория:
+    python -m Benchmarks.Hierarchical --sizes 5000 50000 --chunk-sentences 500 2000
+"""
+
+import argparse
+import json
+import sys
+from time import perf_counter
+
+from TextRank import Hierarchical, Summarizer
+from .Documents import DOCUMENT_KINDS, SAMPLES, build_document
+
+DEFAULT_SIZES = (5000, 10000, 50000)
+DEFAULT_CHUNK_SENTENCES = (500, 2000)
+
+# Один граф на больший документ не помещается в память.
+EXACT_SIZE_LIMIT = 10000
+
+
+def summary_indexes(document, ratio):
+    return [sentence.index for sentence in document.top(ratio)]
+
+
+def run_benchmark(language, kind, sizes, chunk_sizes, ratio=0.2, processes=None, seed=0, log=None):
+    results = []
+    for size in sizes:
+        text = build_document(kind, language, size, seed)
+        exact = exact_seconds = None
+        if size <= EXACT_SIZE_LIMIT:
+            start = perf_counter()
+            exact = summary_indexes(Summarizer.rank(text, language), ratio)
+            exact_seconds = perf_counter() - start
+            results.append({"size": size, "chunk_sentences": None, "seconds": exact_seconds})
+
+        for chunk_sentences in chunk_sizes:
+            start = perf_counter()
+            document = Hierarchical.rank(text, language, ratio, chunk_sentences=chunk_sentences,
+                                         processes=processes)
+            indexes = summary_indexes(document, ratio)
+            record = {"size": size, "chunk_sentences": chunk_sentences, "seconds": perf_counter() - start,
+                      "final_graph": len(document)}
+            if exact is not None:
+                record["speedup"] = exact_seconds / record["seconds"]
+                record["overlap"] = len(set(indexes) & set(exact)) / len(exact) if exact else None
+            results.append(record)
+            if log is not None:
+                log("%d / %d: %.3f s" % (size, chunk_sentences, record["seconds"]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hierarchical summarization versus a single graph")
+    parser.add_argument("--language", default="english", choices=sorted(SAMPLES))
+    parser.add_argument("--kind", default="synthetic", choices=sorted(DOCUMENT_KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--chunk-sentences", nargs="+", type=int, default=list(DEFAULT_CHUNK_SENTENCES))
+    parser.add_argument("--ratio", type=float, default=0.2)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_benchmark(args.language, args.kind, args.sizes, args.chunk_sentences, args.ratio,
+                            args.processes, args.seed, log)
+    json.dump({"parameters": vars(args), "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
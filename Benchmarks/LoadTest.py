@@ -0,0 +1,102 @@
+"""
+Нагрузочный тест HTTP-сервиса TextRank.Server: задержки p50/p99 и пропускная способность.
+
+Запуск из корня репозитория при работающем сервисе:
+    python -m Benchmarks.LoadTest --url http://127.0.0.1:8080 --concurrency 16 --requests 2000
+"""
+
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Lock
+from time import perf_counter
+
+from .Documents import SAMPLES, build_document
+
+
+def percentile(values, fraction):
+    """Процентиль по ближайшему рангу; values должны быть отсортированы."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def post(url, body, timeout):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        error.read()
+        status = error.code
+    except OSError:
+        status = 0  # Соединение не установлено или оборвано.
+    return status, perf_counter() - start
+
+
+def run_load(url, bodies, concurrency, requests, timeout):
+    counter = count()
+    lock = Lock()
+    latencies = []
+    statuses = Counter()
+
+    def client():
+        while True:
+            number = next(counter)
+            if number >= requests:
+                return
+            status, elapsed = post(url, bodies[number % len(bodies)], timeout)
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    duration = perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "throughput_rps": statuses[200] / duration,
+        "statuses": {str(status): number for status, number in sorted(statuses.items())},
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p90": percentile(latencies, 0.90),
+        "latency_p99": percentile(latencies, 0.99),
+        "latency_max": latencies[-1] if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for TextRank.Server")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--endpoint", default="/summarize")
+    parser.add_argument("--language", default="russian", choices=sorted(SAMPLES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 50, 200],
+                        help="document sizes in sentences, used in turn")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    bodies = [json.dumps({"text": build_document("synthetic", args.language, size, seed),
+                          "language": args.language}).encode("utf-8")
+              for seed, size in enumerate(args.sizes)]
+    report = run_load(args.url.rstrip("/") + args.endpoint, bodies, args.concurrency, args.requests, args.timeout)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Сравнение TextRank.Parallel.summarize_many с наивным multiprocessing.Pool.map
+по Summarizer.summarize на наборе документов разной длины.
+
+Запуск из корня репозитория:
+    python -m Benchmarks.Parallel --documents 2000 --processes 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from functools import partial
+from multiprocessing import Pool
+from time import perf_counter
+
+from TextRank import Summarizer
+from TextRank.Parallel import summarize_many
+from .Documents import SAMPLES, build_document
+
+# Длины документов в предложениях: в основном короткие, изредка очень длинные.
+DOCUMENT_SIZES = (5, 10, 20, 50, 100, 500)
+DOCUMENT_WEIGHTS = (30, 30, 20, 12, 6, 2)
+
+
+def build_corpus(language, documents, seed=0):
+    generator = random.Random(seed)
+    sizes = generator.choices(DOCUMENT_SIZES, DOCUMENT_WEIGHTS, k=documents)
+    return [build_document("synthetic", language, size, seed + i) for i, size in enumerate(sizes)]
+
+
+def naive_pool_map(texts, language, processes):
+    with Pool(processes) as pool:
+        return pool.map(partial(Summarizer.summarize, language=language), texts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="summarize_many versus Pool.map")
+    parser.add_argument("--language", default="english", choices=sorted(SAMPLES))
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    texts = build_corpus(args.language, args.documents, args.seed)
+
+    start = perf_counter()
+    expected = naive_pool_map(texts, args.language, args.processes)
+    naive_time = perf_counter() - start
+
+    start = perf_counter()
+    results = summarize_many(texts, args.language, processes=args.processes)
+    pool_time = perf_counter() - start
+
+    json.dump({
+        "documents": len(texts),
+        "characters": sum(len(text) for text in texts),
+        "processes": args.processes,
+        "pool_map_seconds": naive_time,
+        "summarize_many_seconds": pool_time,
+        "speedup": naive_time / pool_time,
+        "identical": results == expected,
+    }, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Число рёбер, скорость и качество ранжирования прореженного графа
+предложений по сравнению с полным.
+
+Запуск из корня репозитория:
+    python -m Benchmarks.Sparsification --sizes 1000 5000 --settings top_k=10 quantile=0.9 threshold=1
+"""
+
+import argparse
+import json
+import sys
+
+from TextRank.Similarity import SimilaritySparsifier
+from .Approximate import run
+from .Benchmark import ranking_agreement
+from .Documents import DOCUMENT_KINDS, SAMPLES, build_document
+
+DEFAULT_SIZES = (1000, 5000)
+DEFAULT_SETTINGS = ("top_k=5", "top_k=20", "quantile=0.5", "quantile=0.9", "top_k=20,quantile=0.5")
+
+PARAMETER_TYPES = {
+    "top_k": int,
+    "threshold": float,
+    "quantile": float,
+    "block_size": int,
+}
+
+
+def parse_setting(setting):
+    """Разбирает строку вида top_k=10,quantile=0.5."""
+    parameters = {}
+    for item in setting.split(","):
+        name, value = item.split("=")
+        parameters[name] = PARAMETER_TYPES[name](value)
+    return SimilaritySparsifier(**parameters)
+
+
+def run_benchmark(language, kind, sizes, settings, seed=0, log=None):
+    results = []
+    for size in sizes:
+        text = build_document(kind, language, size, seed)
+        dense_seconds, dense_stats, dense_result = run(text, language)
+        results.append({"size": size, "setting": "dense", "seconds": dense_seconds, "edges": dense_stats.edges})
+
+        for setting in settings:
+            seconds, stats, result = run(text, language, sparsify=parse_setting(setting))
+            results.append({
+                "size": size,
+                "setting": setting,
+                "seconds": seconds,
+                "edges": stats.edges,
+                "edge_fraction": stats.edges / dense_stats.edges if dense_stats.edges else None,
+                "speedup": dense_seconds / seconds,
+                "agreement": ranking_agreement(result, dense_result),
+            })
+            if log is not None:
+                log("%d %s: %.3f s, %d edges" % (size, setting, seconds, stats.edges))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sparsified sentence graph versus the dense graph")
+    parser.add_argument("--language", default="english", choices=sorted(SAMPLES))
+    parser.add_argument("--kind", default="synthetic", choices=sorted(DOCUMENT_KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--settings", nargs="+", default=list(DEFAULT_SETTINGS),
+                        help="sparsifier parameters such as top_k=10 or quantile=0.9,top_k=20")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_benchmark(args.language, args.kind, args.sizes, args.settings, args.seed, log)
+    json.dump({"parameters": vars(args), "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,30 @@
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from time import perf_counter
 import tkinter as tk
 from tkinter import *
 from tkinter import ttk
 from tkinter.scrolledtext import *
-import sqlite3
 from tkinter import messagebox
 
+# Позволяет запускать форму как python GUI/Form.py из корня репозитория.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TextRank import Summarizer
+from TextRank.Utils.StopWords import LANGUAGES
+from TextRank.Utils.TextCleaner import CachedTextCleaner
+from GUI.History import HistoryStore
+
+DEFAULT_LANGUAGE = 'russian'
+POLL_INTERVAL = 50  # Период опроса результатов рабочего потока, мс
+LIVE_DELAY = 300  # Пауза после последней правки перед живым пересчётом, мс
+HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.text_analyzer_history.sqlite3')
+HISTORY_REFRESH_DELAY = 1000  # Запись в историю идёт пачками, список обновляется позже, мс
+SUMMARY_PARAMETERS = {'ratio': 0.4, 'words': 500}
+
 # Region 1 Start(Window Settings)
 window = Tk()
 window.title("Text Analyzer")
@@ -31,6 +51,7 @@ tab5 = ttk.Frame(tab_control, height=100)
 
 # ADD TABS TO NOTEBOOK
 tab_control.add(tab2, text=f'{"TextRank Algorithm":^20s}')
+tab_control.add(tab3, text=f'{"History ":^30s}')
 tab_control.add(tab5, text=f'{"About ":^30s}')
 
 label2 = Label(tab2, text='TextRank Algorithm', padx=5, pady=5)
@@ -40,18 +61,238 @@ label4 = Label(tab5, text='About', padx=5, pady=5)
 label4.grid(column=0, row=0)
 
 tab_control.pack(expand=1, fill='both')
+
+# История резюме: одинаковый текст с теми же параметрами берётся из базы.
+history = HistoryStore(HISTORY_PATH)
 # Region 1 End(Window Settings)
 
 def deEmojify(inputString):
     return inputString.encode('ascii', 'ignore').decode('ascii')
 
 
+# Region 2 Start(Background Summarization)
+# Резюме считается в рабочем потоке, результат забирается опросом через window.after,
+# поэтому окно не замирает на длинных текстах.
+job_results = queue.Queue()
+job_counter = 0
+running_job = None
+job_started = 0
+job_is_live = False
+
+# Очистители с кэшем основ по предложениям: при правке текста заново
+# обрабатываются только изменённые предложения.
+text_cleaners = {}
+
+
+def get_cleaner(language):
+	if language not in text_cleaners:
+		text_cleaners[language] = CachedTextCleaner(language)
+	return text_cleaners[language]
+
+
+def run_summarize_job(job, text, language, live):
+	key = history.key(text, language, SUMMARY_PARAMETERS)
+	result = history.lookup(key)
+	if result is not None:
+		job_results.put((job, result, True))
+		return
+
+	try:
+		started = perf_counter()
+		result = Summarizer.summarize(text, language, cleaner=get_cleaner(language), **SUMMARY_PARAMETERS)
+		# Промежуточные состояния живого режима в историю не попадают.
+		if not live:
+			history.add(key, language, SUMMARY_PARAMETERS, text, result, perf_counter() - started)
+	except Exception as error:
+		result = error
+	job_results.put((job, result, False))
+
+
+def set_running(running):
+	if running:
+		b2.config(state=DISABLED)
+		b_cancel.config(state=NORMAL)
+		progress.start(10)
+	else:
+		b2.config(state=NORMAL)
+		b_cancel.config(state=DISABLED)
+		progress.stop()
+
+
 def summarize():
 	text = str(displayed_file.get('1.0',tk.END))
-	if text == '\n':
+	if text.strip() == '':
 		messagebox.showinfo("Error", "Input field cannot be empty")
-	else:
-		tab2_display_text.insert(INSERT, Summarizer.summarize(text, ratio=0.4, words=500))
+		return
+	start_job(text, live=False)
+
+
+def start_job(text, live):
+	global job_counter, running_job, job_started, job_is_live
+	job_counter += 1
+	running_job = job_counter
+	job_started = perf_counter()
+	job_is_live = live
+	set_running(True)
+	status_label.config(text='Summarizing...')
+	threading.Thread(target=run_summarize_job, args=(running_job, text, language_box.get(), live),
+		daemon=True).start()
+	window.after(POLL_INTERVAL, poll_results)
+
+
+def poll_results():
+	global running_job
+	while True:
+		try:
+			job, result, from_history = job_results.get_nowait()
+		except queue.Empty:
+			break
+
+		# Результаты отменённых задач отбрасываются.
+		if job != running_job:
+			continue
+
+		running_job = None
+		set_running(False)
+		if isinstance(result, Exception):
+			status_label.config(text='Failed')
+			if not job_is_live:
+				messagebox.showinfo("Error", str(result))
+		elif job_is_live:
+			# Живой режим заменяет результат на месте, а не дописывает его.
+			status_label.config(text='Live: %.0f ms' % ((perf_counter() - job_started) * 1000))
+			if tab2_display_text.get('1.0', 'end-1c') != result:
+				tab2_display_text.delete('1.0', END)
+				tab2_display_text.insert('1.0', result)
+		else:
+			if from_history:
+				status_label.config(text='Done (from history)')
+			else:
+				status_label.config(text='Done in %.2f s' % (perf_counter() - job_started))
+				window.after(HISTORY_REFRESH_DELAY, refresh_history)
+			tab2_display_text.insert(INSERT, result)
+
+	if running_job is not None:
+		status_label.config(text='Summarizing... %.1f s' % (perf_counter() - job_started))
+		window.after(POLL_INTERVAL, poll_results)
+
+
+def cancel_summarize():
+	# Поток нельзя прервать, поэтому он дорабатывает в фоне, а его результат не показывается.
+	global running_job
+	running_job = None
+	set_running(False)
+	status_label.config(text='Cancelled')
+
+
+# Живой режим: пересчёт после паузы в наборе текста.
+live_timer = None
+
+
+def on_text_modified(event=None):
+	global live_timer
+	displayed_file.edit_modified(False)
+	if not live_mode.get():
+		return
+	if live_timer is not None:
+		window.after_cancel(live_timer)
+	live_timer = window.after(LIVE_DELAY, live_summarize)
+
+
+def live_summarize():
+	global live_timer
+	live_timer = None
+	# Пока идёт пересчёт, следующий откладывается ещё на одну паузу.
+	if running_job is not None:
+		live_timer = window.after(LIVE_DELAY, live_summarize)
+		return
+	text = str(displayed_file.get('1.0',tk.END))
+	if text.strip() != '':
+		start_job(text, live=True)
+
+# Region 2 End(Background Summarization)
+
+# Region 3 Start(History)
+# Запросы к истории тоже выполняются в рабочих потоках, а ответы забираются
+# опросом через window.after: поиск не задерживает окно, даже если база
+# занята поиском результата для резюме.
+history_results = queue.Queue()
+history_requests = {'search': 0, 'get': 0}  # Номер последнего запроса каждого вида
+history_pending = 0
+history_polling = False
+
+
+def request_history(kind, function, *args):
+	global history_pending, history_polling
+	history_requests[kind] += 1
+	request = history_requests[kind]
+
+	def run():
+		try:
+			result = function(*args)
+		except Exception as error:
+			result = error
+		history_results.put((kind, request, result))
+
+	history_pending += 1
+	threading.Thread(target=run, daemon=True).start()
+	if not history_polling:
+		history_polling = True
+		window.after(POLL_INTERVAL, poll_history)
+
+
+def poll_history():
+	global history_pending, history_polling
+	while True:
+		try:
+			kind, request, result = history_results.get_nowait()
+		except queue.Empty:
+			break
+		history_pending -= 1
+
+		# Ответы на устаревшие запросы и ошибки базы не показываются.
+		if request != history_requests[kind] or isinstance(result, Exception):
+			continue
+		if kind == 'search':
+			show_history_list(result)
+		else:
+			show_history_summary(result)
+
+	history_polling = history_pending > 0
+	if history_polling:
+		window.after(POLL_INTERVAL, poll_history)
+
+
+def refresh_history(event=None):
+	request_history('search', history.search, history_query.get())
+
+
+def show_history_list(records):
+	history_list.delete(*history_list.get_children())
+	for record_id, created, language, seconds, text in records:
+		created = datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M')
+		preview = ' '.join(text.split())[:80]
+		history_list.insert('', END, iid=str(record_id), values=(created, language, '%.2f' % seconds, preview))
+
+
+def show_history_record(event=None):
+	selection = history_list.selection()
+	if not selection:
+		return
+	request_history('get', history.get, int(selection[0]))
+
+
+def show_history_summary(record):
+	history_display_text.delete('1.0', END)
+	if record is not None:
+		history_display_text.insert('1.0', record['summary'])
+
+
+def on_close():
+	history.close()
+	window.destroy()
+
+# Region 3 End(History)
 
 # Clear entry widget
 
@@ -81,6 +322,24 @@ b1.grid(row=3,column=1,padx=10,pady=10)
 b3=Button(tab2,text="Clear Result", width=12,command=clear_text_result, bg='#03A9F4',fg='#fff')
 b3.grid(row=5,column=1,padx=10,pady=10)
 
+language_box = ttk.Combobox(tab2, values=sorted(LANGUAGES), state='readonly', width=12)
+language_box.set(DEFAULT_LANGUAGE)
+language_box.grid(row=3,column=2,padx=10,pady=10)
+
+b_cancel=Button(tab2,text="Cancel ", width=12,command=cancel_summarize,state=DISABLED,bg='#03A9F4',fg='#fff')
+b_cancel.grid(row=5,column=0,padx=10,pady=10)
+
+status_label = Label(tab2, text='')
+status_label.grid(row=5,column=2,padx=10,pady=10)
+
+progress = ttk.Progressbar(tab2, mode='indeterminate')
+progress.grid(row=6,column=0, columnspan=3,padx=5,pady=3,sticky='we')
+
+live_mode = BooleanVar(value=False)
+live_check = Checkbutton(tab2, text="Live", variable=live_mode, command=on_text_modified)
+live_check.grid(row=1,column=2,padx=10,pady=3)
+displayed_file.bind('<<Modified>>', on_text_modified)
+
 # Display Screen
 # tab2_display_text = Text(tab2)
 tab2_display_text = ScrolledText(tab2,height=10)
@@ -89,4 +348,27 @@ tab2_display_text.grid(row=7,column=0, columnspan=3,padx=5,pady=5)
 # Allows you to edit
 tab2_display_text.config(state=NORMAL)
 
+#History tab
+history_query = StringVar()
+history_entry = Entry(tab3, textvariable=history_query, width=60)
+history_entry.grid(row=1,column=0,columnspan=2,padx=5,pady=5,sticky='we')
+history_entry.bind('<Return>', refresh_history)
+
+b_search=Button(tab3,text="Search ", width=12,command=refresh_history,bg='#03A9F4',fg='#fff')
+b_search.grid(row=1,column=2,padx=10,pady=5)
+
+history_list = ttk.Treeview(tab3, columns=('created', 'language', 'seconds', 'text'), show='headings', height=8)
+for column, title, width in (('created', 'Date', 120), ('language', 'Language', 80), ('seconds', 'Seconds', 60),
+		('text', 'Text', 400)):
+	history_list.heading(column, text=title)
+	history_list.column(column, width=width)
+history_list.grid(row=2,column=0,columnspan=3,padx=5,pady=5)
+history_list.bind('<<TreeviewSelect>>', show_history_record)
+
+history_display_text = ScrolledText(tab3,height=10)
+history_display_text.grid(row=3,column=0, columnspan=3,padx=5,pady=5)
+
+refresh_history()
+window.protocol('WM_DELETE_WINDOW', on_close)
+
 window.mainloop()
\ No newline at end of file
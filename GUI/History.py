@@ -0,0 +1,159 @@
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from TextRank.Cache import ALGORITHM_VERSION
+
+# Сколько записей писать одной транзакцией и сколько ждать, пока они наберутся, с.
+WRITE_BATCH_SIZE = 64
+WRITE_BATCH_DELAY = 0.5
+
+SEARCH_LIMIT = 200
+
+_STOP = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    created REAL NOT NULL,
+    language TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    text TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_key ON history (key);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5 (
+    text, summary, content='history', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, text, summary) VALUES (new.id, new.text, new.summary);
+END;
+"""
+
+
+class HistoryStore(object):
+    """
+    История резюме формы в SQLite: хеш текста, параметры, резюме и время расчёта.
+    Запись идёт пачками в отдельном потоке, поэтому не задерживает интерфейс.
+    Для поиска используется индекс FTS5, если SQLite собран с ним, иначе LIKE.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._read_lock = threading.Lock()
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        try:
+            self._reader.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+
+        self._writes = queue.Queue()
+        # Ещё не записанные резюме доступны для lookup сразу.
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="HistoryStore writer", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def key(text, language, parameters):
+        """Хеш текста, языка, параметров и версии алгоритма."""
+        description = json.dumps([ALGORITHM_VERSION, language, parameters], sort_keys=True)
+        return hashlib.sha256((description + "\0" + text).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """Возвращает последнее сохранённое резюме для ключа или None."""
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key]
+        with self._read_lock:
+            row = self._reader.execute("SELECT summary FROM history WHERE key = ? ORDER BY id DESC LIMIT 1",
+                                       (key,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, key, language, parameters, text, summary, seconds):
+        """Ставит запись в очередь на запись; не блокирует вызывающий поток."""
+        with self._pending_lock:
+            self._pending[key] = summary
+        self._writes.put((key, time.time(), language, json.dumps(parameters, sort_keys=True), text, summary,
+                          seconds))
+
+    def search(self, query="", limit=SEARCH_LIMIT):
+        """Возвращает строки (id, время, язык, секунды, начало текста) новые сверху."""
+        columns = "history.id, history.created, history.language, history.seconds, substr(history.text, 1, 200)"
+        with self._read_lock:
+            if not query.strip():
+                return self._reader.execute("SELECT %s FROM history ORDER BY id DESC LIMIT ?" % columns,
+                                            (limit,)).fetchall()
+            if self.has_fts:
+                statement = "SELECT %s FROM history_fts JOIN history ON history.id = history_fts.rowid " \
+                            "WHERE history_fts MATCH ? ORDER BY rank LIMIT ?" % columns
+                try:
+                    return self._reader.execute(statement, (query, limit)).fetchall()
+                except sqlite3.OperationalError:
+                    # Строка не является запросом FTS5, ищется как обычная фраза.
+                    phrase = '"%s"' % query.replace('"', '""')
+                    return self._reader.execute(statement, (phrase, limit)).fetchall()
+            pattern = "%" + query + "%"
+            return self._reader.execute("SELECT %s FROM history WHERE text LIKE ? OR summary LIKE ? "
+                                        "ORDER BY id DESC LIMIT ?" % columns, (pattern, pattern, limit)).fetchall()
+
+    def get(self, record_id):
+        """Возвращает запись словарём или None."""
+        with self._read_lock:
+            cursor = self._reader.execute("SELECT id, created, language, parameters, text, summary, seconds "
+                                          "FROM history WHERE id = ?", (record_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    def close(self):
+        """Дописывает очередь и закрывает соединения."""
+        self._writes.put(_STOP)
+        self._writer.join()
+        with self._read_lock:
+            self._reader.close()
+
+    # Вспомогательные методы
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _write_loop(self):
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._writes.get()]
+            deadline = time.monotonic() + WRITE_BATCH_DELAY
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._writes.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            if _STOP in batch:
+                stopping = True
+                batch = [record for record in batch if record is not _STOP]
+            if batch:
+                with connection:
+                    connection.executemany("INSERT INTO history (key, created, language, parameters, text, "
+                                           "summary, seconds) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                with self._pending_lock:
+                    for record in batch:
+                        if self._pending.get(record[0]) is record[5]:
+                            del self._pending[record[0]]
+        connection.close()
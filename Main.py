@@ -1,27 +1,205 @@
-from TextRank import Summarizer
-
-text = """
-«Не умирайте пару часов»
-
-С лета 2014 г. работники «скорой» Василеостровского района воюют с собственным руководством: собирают на митинги до сотни человек, пишут письма губернатору и президенту, не вылезают из судов. По их словам, укомплектованность службы бригадами медиков на данный момент в 1,5 раза меньше нормы, уже сегодня можно прождать прибытия «скорой» несколько часов.Кардиологическую специализированную бригаду сократили год назад: теперь на инфаркты выезжает обычный экипаж врачей без специального оборудования. Наблюдаются странные эксперименты с общей очередью без возрастного деления пациентов: на вызов к взрослому может приехать педиатр, а к ребёнку – терапевт. Сокращаются и ставки докторов: обязанности уволенных перекладывают на оставшихся без дополнительной оплаты за переработку.
-– При нашей поликлинике единственная в районе станция «скорой», где раньше в строю было по 12 экипажей, а сегодня 7–8, – говорит Мария Куклева, бывший фельдшер с 12-летним стажем и глава профсоюза сотрудников городской поликлиники №4. – Раньше нами руководили специалисты с опытом выездной работы, а сегодняшний начальник Алишер Абдуллаев в прошлом курировал в поликлинике отделение платных услуг. Вначале он пытался не платить нам стимулирующие надбавки и не индексировать оклады, как положено по закону. В результате наши реальные заработки упали в полтора раза, люди начали увольняться или протестовать. Проблемы коллектива, естественно, отразились на качестве услуг населению.
-Гражданин со стороны сильно удивился бы, узнав, что карета «скорой помощи» может не принадлежать государственному медучреждению, а арендоваться у частной компании по 600 рублей в час. То есть за 15 тыс. рублей в сутки, 450 тыс. в месяц, около 5,5 млн в год. Рассуждая на каждом углу об экономии бюджета, разве не проще купить машины в собственность?
-С переходом на систему ОМС оплата происходит непосредственно за выезд бригады. Выезд стоит 3 тыс. рублей, а по времени может занимать от 30 минут до нескольких часов, если приходится реанимировать пациента, госпитализировать его в больницу, оформлять там документы. А 600 рублей в час за машину тикают. И зарплата двух медиков и шофёра тоже. Плюс обслуживание станции, бензин, медикаменты. Но разве не дико рассматривать «скорую» как коммерческое предприятие вроде такси?
-Конечно, «рентабельности» требуют не везде и не всегда, но частенько. Если руководитель хочет зарабатывать, у него возникает соблазн «оптимизировать» работу, сократив число бригад. При этом он прекрасно понимает, что в часы пик (например, утром и днём в понедельник) звонки образуют очередь в несколько часов. Также очевидно, что при инфаркте есть «золотой час», в течение которого пациента ещё можно спасти. А если помощь приедет через 5 часов? А ведь так происходит далеко не в глубинке.
-– Наш главврач пошёл по пути оптимизации необыкновенно далеко, – говорит Куклева. – Когда я работала, на машину приходилось 10,6 вызова в сутки, а сегодня мне рассказывают про норму в 18 вызовов. Как этого достичь? Например, объединить детские и взрослые вызовы в одну очередь. С точки зрения эффективности помощи дико отправлять к 70-летней инфарктнице детского врача. Зато деловая логика есть: ведь бывают дни, когда обе детские бригады в районе получают всего один-два вызова. И кого волнует, что когда ребёнка действительно покусает собака, у приехавшей бригады не будет детских медикаментов?
-Ещё одно ноу-хау петербургских оптимизаторов: отправлять «скорую» по звонку к человеку, у которого болит голова. Казалось бы, ненормально, когда бригада везёт аспирин очнувшемуся с бодуна алкоголику, пока пациент с инсультом тихо умирает в ожидании. Но и здесь своя логика есть: за вызов терапевта из поликлиники фонд ОМС платит 500 рублей, а за вызов «скорой» – в 6 раз дороже. Для бизнеса важно загрузить бригады работой в относительно спокойные часы суток. Обратная сторона медали: в часы пик, когда дороги загружены или народ «гуляет», помощи можно ждать по 5–6 часов. На тот же 220-тысячный Васильевский остров не всегда можно вызвать «скорую» из городской станции: во-первых, далеко, во-вторых, по ночам большую часть года разведены мосты.
-Это не будет быстро
-Но дело, разумеется, не в одном Петербурге, где сенаторы Тюльпанов и Владимир Фёдоров недавно попросили разобраться с использованием машин «скорой помощи» в качестве такси. В Севастополе, на который Москва не жалеет средств, уволили около 50 сотрудников Центра медицины катастроф и скорой помощи. В СМИ сообщалось, что ещё в 2014 г. работники «скорой» получали около 20 тыс. рублей. Сейчас их оклад равен 12 тыс., а в трудовом договоре – всего 5,5 тысячи.
-Похожие сообщения из Иркутской области: в определённый момент в Братске вместо 70 специалистов в штате подстанции «скорой помощи» находились лишь 15 человек. И те вынуждены ездить в одиночку на ночные вызовы. Причина повальных увольнений – низкая зарплата. В 2013 г. врачам и фельдшерам по всей России понизили ставки, пообещав с лихвой возместить потерянное премиальными. Возместили не всё и не всем. В Ярославской области заработки на «скорой» оказались втрое ниже, чем в соседней Московской. Как следствие: начался исход специалистов. А кому хочется работать за копейки, когда приезжаешь через несколько часов после вызова и принимаешь на себя весь гнев заждавшегося пациента? Молодой женщине сильно интересно звонить по ночам в дверь, за которой может оказаться притон с пьяными уголовниками? И как она одна вынесет носилки с пациентом при необходимости? Что ей скажут соседи, если она станет просить о помощи в три часа ночи?
-Большинство проблем российского здравоохранения – из одного корня. Социальную сферу сбрасывают с державного плеча в регионы, где под «оптимизацией» подразумевают рентабельность. К концу 2018 г. планируется оптимизировать 950 медицинских организаций, из которых 41 ликвидируется полностью. Светлые планы реформирования «скорой» по образцу американских сериалов обернулись былью в виде запряжённой в телегу старой лошади с красным крестом на боку, поскольку в тысячи деревень в XXI веке по полгода не проехать из-за состояния дорог.
-Даже в крупных городах «скорым» не выделяется бензин, нет необходимых лекарств, аппаратов наркоза, вентиляции лёгких. В Новосибирске экипаж не довёз до больницы двухлетнего ребёнка, потому что в машине кончилось топливо. В Алтайском крае прокуроры констатируют: «отсутствие «скорой помощи» приводит к смерти нуждающихся в ней граждан». В 75-тысячном Кирово-Чепецке служба «скорой» возникла лишь после того, как городской прокурор вышел в суд с иском к горадминистрации. В Курганской области умер пенсионер, к которому отказалась ехать «скорая». Разбор полётов показал, что существует приказ главврача больницы: экипаж выезжает только с согласия главы поселковой администрации. Врачам дали по два года, чиновники отделались выговорами.
-– Начальство негласно рекомендует нам не брать в стационар граждан старше 65 лет, – говорит врач одной из больниц в Ленинградской области. – Мест на всех не хватает, стараются спасать тех, кто помоложе. Старики об этом знают и, вызывая «скорую», занижают возраст, поэтому диспетчер сначала пробивает телефон, с которого поступил звонок. В такой обстановке трудно думать о спасении жизней! Полно историй, когда врачи «скорой» продают информацию о тяжёлом пациенте ритуальным агентам.
-На фоне этих безобразий всё настойчивее звучит идея появления платной государственной «скорой». Сколько часов тогда будут ездить к «бесплатникам», если уже сегодня известны случаи отказа в госпитализации при отсутствии полиса?
-– Станция «скорой помощи» – это государственное или муниципальное учреждение, где, по Конституции, помощь должна оказываться бесплатно, – говорит Александр Саверский, президент «Лиги защиты пациентов». – Создание платных подструктур нарушает Конституцию, врач не имеет права принимать деньги от нуждающегося в спасении гражданина. Тем не менее в Законе об обязательном медицинском страховании есть формулировка: «Полис является основанием для оказания медицинской помощи». И уже не так уж и важно, что в том же законе написано: скорая помощь оказывается вне зависимости от предъявления полиса ОМС. Первый вопрос фельдшера, приехавшего по вызову к пациенту, будет: «Где полис?» Поскольку зарплата-то фельдшера – из ОМС, и он об этом знает.
-Вероятно, нас ждёт немало разоблачений о злоупотреблениях посредством действующей системы. Хотя вряд ли кто-то сможет подсчитать, во сколько жизней они уже обошлись.
+"""
+Пакетное резюмирование из командной строки.
+
+Читает записи JSONL ({"id": ..., "text": ...}) или текстовые файлы и каталоги,
+в том числе сжатые gzip и xz, со стандартного ввода или с диска. Резюмирует
+их параллельно и по мере готовности пишет JSONL с результатом и временем
+обработки каждой записи. С --resume пропускает записи, уже записанные в --output;
+записи, упавшие с ошибкой резюмирования, обрабатываются повторно, и для такого
+идентификатора верна последняя строка файла.
 
+    python Main.py articles.jsonl.gz --language russian --output summaries.jsonl
+    cat articles.jsonl | python Main.py --language english --words 100
 """
 
-text_res = Summarizer.summarize(text, language='russian', ratio=0.2)
+import argparse
+import gzip
+import io
+import json
+import lzma
+import os
+import sys
+
+from TextRank.Parallel import SummaryPool
+
+COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+}
+
+JSONL_SUFFIXES = (".jsonl", ".json", ".ndjson")
+
+
+def _split_compression(path):
+    base, suffix = os.path.splitext(path)
+    if suffix in COMPRESSED_OPENERS:
+        return base, COMPRESSED_OPENERS[suffix]
+    return path, open
+
+
+def iter_paths(paths):
+    """Раскрывает каталоги в отсортированный список файлов."""
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories.sort()
+                for name in sorted(files):
+                    yield os.path.join(directory, name)
+        else:
+            yield path
+
+
+class InvalidRecord(Exception):
+    """Запись входа, которую нельзя прочитать; попадает в выход как ошибка этой записи."""
+
+
+def iter_jsonl_records(lines, source, id_field, text_field):
+    """
+    Выдаёт пары (идентификатор, текст). Вместо текста испорченной строки
+    или записи без поля текста выдаётся InvalidRecord, чтобы одна плохая
+    запись не останавливала весь пакет.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        record_id = "%s:%d" % (source, line_number)
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield record_id, InvalidRecord("invalid JSON: %s" % error)
+            continue
+        if not isinstance(record, dict):
+            yield record_id, InvalidRecord("record is not a JSON object")
+            continue
+
+        record_id = record.get(id_field, record_id)
+        if text_field not in record:
+            yield record_id, InvalidRecord("missing field %r" % text_field)
+            continue
+        yield record_id, record[text_field]
+
+
+def iter_records(paths, id_field="id", text_field="text"):
+    """Выдаёт пары (идентификатор, текст) из файлов или стандартного ввода."""
+    if not paths or paths == ["-"]:
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        yield from iter_jsonl_records(stdin, "<stdin>", id_field, text_field)
+        return
+
+    for path in iter_paths(paths):
+        base, opener = _split_compression(path)
+        with opener(path, "rt", encoding="utf-8") as stream:
+            if base.endswith(JSONL_SUFFIXES):
+                yield from iter_jsonl_records(stream, path, id_field, text_field)
+            else:
+                # Текстовый файл - одна запись, идентификатор - путь.
+                yield path, stream.read()
+
+
+def load_completed(output_path):
+    """
+    Возвращает идентификаторы записей, уже обработанных в прошлом запуске:
+    успешно или с InvalidRecord, которую повтор не исправит.
+    Оборванная последняя строка отрезается, чтобы дописывание продолжилось с неё.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "rb+") as output:
+        valid_length = 0
+        for line in output:
+            if not line.endswith(b"\n"):
+                break
+            valid_length += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Испорченная целая строка остаётся в файле, её запись обрабатывается повторно.
+                continue
+            if not isinstance(record, dict) or "id" not in record:
+                continue
+            # Записи с ошибкой резюмирования обрабатываются повторно, новая строка
+            # дописывается после старой, и верной считается последняя.
+            error = record.get("error")
+            if error is None or error.startswith(InvalidRecord.__name__ + ":"):
+                completed.add(record["id"])
+        output.truncate(valid_length)
+    return completed
+
+
+def run(records, output, language, parameters, processes=None, additional_stopwords=None, ordered=False,
+        completed=frozenset()):
+    """Резюмирует записи и пишет результаты в output; возвращает число записанных строк."""
+    pending_ids = {}
+    invalid = {}
+
+    def texts():
+        for index, (record_id, text) in enumerate(
+                record for record in records if record[0] not in completed):
+            pending_ids[index] = record_id
+            if isinstance(text, InvalidRecord):
+                # Пустой текст проходит через пул, чтобы ошибка заняла своё место при --ordered.
+                invalid[index] = text
+                text = ""
+            yield text
+
+    written = 0
+    with SummaryPool(language, additional_stopwords, processes) as pool:
+        for index, result, elapsed in pool.imap(texts(), ordered=ordered, timings=True, return_exceptions=True,
+                                                 **parameters):
+            record = {"id": pending_ids.pop(index), "seconds": round(elapsed, 6)}
+            result = invalid.pop(index, result)
+            if isinstance(result, Exception):
+                record["error"] = "%s: %s" % (type(result).__name__, result)
+            else:
+                record["summary"] = result
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming TextRank summarization of JSONL and text files")
+    parser.add_argument("inputs", nargs="*", help="JSONL or text files and directories, .gz/.xz allowed; "
+                                                  "standard input (JSONL) by default")
+    parser.add_argument("--language", required=True)
+    parser.add_argument("--ratio", type=float, default=0.2)
+    parser.add_argument("--words", type=int)
+    parser.add_argument("--split", action="store_true", help="summary as a list of sentences")
+    parser.add_argument("--scores", action="store_true", help="summary as [sentence, score] pairs")
+    parser.add_argument("--knapsack", action="store_true", help="fill the --words budget optimally")
+    parser.add_argument("--engine", default="sparse")
+    parser.add_argument("--stopwords", nargs="*", default=None, help="additional stopwords")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--ordered", action="store_true", help="write results in input order")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--output", help="output JSONL file; standard output by default")
+    parser.add_argument("--resume", action="store_true", help="skip records already written to --output")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+
+    parameters = dict(ratio=args.ratio, words=args.words, split=args.split, scores=args.scores,
+                      engine=args.engine, knapsack=args.knapsack)
+    completed = load_completed(args.output) if args.resume else frozenset()
+    records = iter_records(args.inputs, args.id_field, args.text_field)
+
+    if args.output:
+        with open(args.output, "a" if args.resume else "w", encoding="utf-8") as output:
+            written = run(records, output, args.language, parameters, args.processes, args.stopwords,
+                          args.ordered, completed)
+    else:
+        output = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", line_buffering=False)
+        written = run(records, output, args.language, parameters, args.processes, args.stopwords,
+                      args.ordered, completed)
+        output.detach()
+
+    print("%d records written, %d skipped" % (written, len(completed)), file=sys.stderr)
+
 
-print(text_res)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
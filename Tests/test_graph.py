@@ -0,0 +1,90 @@
+"""
+Проверка ArrayGraph против словарного Graph: одна и та же случайная
+последовательность операций должна давать одинаковые узлы, рёбра и веса.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TextRank.Graph import ArrayGraph, Graph
+
+OPERATIONS = 400
+SEEDS = range(30)
+
+
+def _undirected(edges):
+    return {frozenset(edge) for edge in edges}
+
+
+class ArrayGraphTest(unittest.TestCase):
+
+    def assertSameGraph(self, array_graph, graph):
+        nodes = graph.nodes()
+        self.assertEqual(sorted(array_graph.nodes()), sorted(nodes))
+        self.assertEqual(_undirected(array_graph.edges()), _undirected(graph.edges()))
+        for u in nodes:
+            self.assertEqual(sorted(array_graph.neighbors(u)), sorted(graph.neighbors(u)))
+            for v in nodes:
+                if u == v:
+                    continue
+                self.assertEqual(array_graph.has_edge((u, v)), graph.has_edge((u, v)))
+                # Graph.edge_weight создаёт запись для отсутствующего ребра, поэтому
+                # вес сравнивается только для существующих.
+                if graph.has_edge((u, v)):
+                    self.assertEqual(array_graph.edge_weight((u, v)), graph.edge_weight((u, v)))
+
+    def test_random_operations(self):
+        for seed in SEEDS:
+            rnd = random.Random(seed)
+            array_graph, graph = ArrayGraph(), Graph()
+            names = ["n%d" % i for i in range(12)]
+            for step in range(OPERATIONS):
+                nodes = graph.nodes()
+                operation = rnd.random()
+                if operation < 0.2 or len(nodes) < 2:
+                    missing = [name for name in names if not graph.has_node(name)]
+                    if missing:
+                        node = rnd.choice(missing)
+                        array_graph.add_node(node)
+                        graph.add_node(node)
+                elif operation < 0.6:
+                    u, v = rnd.sample(nodes, 2)
+                    if not graph.has_edge((u, v)):
+                        weight = rnd.choice((1, 0.5, rnd.random()))
+                        array_graph.add_edge((u, v), weight)
+                        graph.add_edge((u, v), weight)
+                elif operation < 0.85:
+                    edges = [edge for edge in graph.edges()]
+                    if edges:
+                        edge = rnd.choice(edges)
+                        array_graph.del_edge(edge)
+                        graph.del_edge(edge)
+                else:
+                    node = rnd.choice(nodes)
+                    array_graph.del_node(node)
+                    graph.del_node(node)
+
+                if step % 25 == 0:
+                    with self.subTest(seed=seed, step=step):
+                        self.assertSameGraph(array_graph, graph)
+            with self.subTest(seed=seed):
+                self.assertSameGraph(array_graph, graph)
+
+    def test_existing_edge_is_rejected(self):
+        graph = ArrayGraph()
+        graph.add_node("a")
+        graph.add_node("b")
+        graph.add_edge(("a", "b"), 2)
+        with self.assertRaises(ValueError):
+            graph.add_edge(("b", "a"), 3)
+        graph.del_edge(("b", "a"))
+        with self.assertRaises(ValueError):
+            graph.del_edge(("a", "b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Проверка выбора предложений RankedDocument: ленивое ранжирование против
+полной устойчивой сортировки и рюкзак по числу слов против полного перебора.
+"""
+
+import os
+import random
+import sys
+import unittest
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TextRank.Summarizer import RankedDocument, _get_sentences_with_word_count_knapsack
+from TextRank.Utils.TextCleaner import SyntacticUnit
+
+SEEDS = range(200)
+
+
+def _random_sentences(rnd, count):
+    sentences = []
+    for index in range(count):
+        sentence = SyntacticUnit(" ".join("w%d" % i for i in range(rnd.randint(1, 9))))
+        sentence.index = index
+        # Повторяющиеся оценки проверяют порядок равных элементов.
+        sentence.score = rnd.choice((0.1, 0.2, 0.3, rnd.random()))
+        sentences.append(sentence)
+    return sentences
+
+
+def _best_total(sentences, words):
+    best = 0.0
+    for size in range(1, len(sentences) + 1):
+        for subset in combinations(sentences, size):
+            if sum(s.word_count for s in subset) <= words:
+                best = max(best, sum(s.score for s in subset))
+    return best
+
+
+class RankingTest(unittest.TestCase):
+
+    def test_matches_stable_sort(self):
+        for seed in SEEDS:
+            rnd = random.Random(seed)
+            sentences = _random_sentences(rnd, rnd.randint(0, 30))
+            expected = sorted(sentences, key=lambda s: s.score, reverse=True)
+            document = RankedDocument(sentences)
+            for _ in range(4):
+                count = rnd.randint(0, len(sentences) + 2)
+                with self.subTest(seed=seed, count=count):
+                    if rnd.random() < 0.5:
+                        self.assertEqual(document.head(count), expected[:count])
+                    else:
+                        ranking = document.iter_ranking()
+                        self.assertEqual([s for _, s in zip(range(count), ranking)], expected[:count])
+            self.assertEqual(document.ranking, expected)
+
+    def test_ratio_counts_from_length(self):
+        sentences = _random_sentences(random.Random(0), 10)
+        self.assertEqual(len(RankedDocument(sentences).top(0.5)), 5)
+        self.assertEqual(len(RankedDocument(sentences, length=4).top(0.5)), 2)
+
+
+class KnapsackTest(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        for seed in SEEDS:
+            rnd = random.Random(seed)
+            sentences = _random_sentences(rnd, rnd.randint(0, 11))
+            words = rnd.randint(0, 30)
+            selected = _get_sentences_with_word_count_knapsack(sentences, words)
+            with self.subTest(seed=seed, words=words):
+                self.assertLessEqual(sum(s.word_count for s in selected), words)
+                self.assertEqual(len(set(map(id, selected))), len(selected))
+                self.assertAlmostEqual(sum(s.score for s in selected), _best_total(sentences, words))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Проверка RussianStemmer по эталонным основам.
+
+Эталон Data/russian_stems.txt.gz - пары «слово<TAB>основа», полученные
+исходной реализацией стеммера (до ускорения транслитерации и поиска
+суффиксов) для слов generate_words(): слов образцов и стоп-слов,
+сочетаний корней со всеми суффиксами таблиц стеммера и слов со смешанным
+алфавитом. Пересоздать эталон текущим стеммером:
+    python Tests/test_stemmer.py --write-reference
+"""
+
+import gzip
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TextRank.Utils.SnowBall import RussianStemmer
+
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data", "russian_stems.txt.gz")
+
+ROOTS = ("книг", "дом", "стол", "говор", "бел", "работ", "сказ", "люб", "пис", "нов", "ум", "взгляд",
+         "мысл", "а", "вс", "при", "ёлк", "объём")
+MIXED_ROOTS = ("dом", "kнига", "стoл", "abc", "xyz")
+COMBINED_TABLES = (
+    ("derivational", "noun"),
+    ("superlative", "noun"),
+    ("adjectival", "reflexive"),
+    ("verb", "reflexive"),
+)
+
+
+def _suffix_tables():
+    stemmer = RussianStemmer()
+    to_cyrillic = stemmer._RussianStemmer__roman_to_cyrillic
+    tables = {}
+    for name in ("perfective_gerund", "adjectival", "reflexive", "verb", "noun", "superlative", "derivational"):
+        tables[name] = [to_cyrillic(suffix) for suffix in getattr(stemmer, "_RussianStemmer__%s_suffixes" % name)]
+    return tables
+
+
+def generate_words():
+    """Слова для эталона; порядок детерминирован."""
+    from Benchmarks.Documents import RUSSIAN_SAMPLE
+    from TextRank.Utils.StopWords import get_stopwords_by_language
+
+    words = RUSSIAN_SAMPLE.lower().replace(",", " ").replace(".", " ").split()
+    words.extend(get_stopwords_by_language("russian").split())
+
+    tables = _suffix_tables()
+    for root in ROOTS + MIXED_ROOTS:
+        for suffixes in tables.values():
+            words.extend(root + suffix for suffix in suffixes)
+        for first, second in COMBINED_TABLES:
+            words.extend(root + a + b for a in tables[first] for b in tables[second])
+        words.extend((root.upper(), root + "ь", root + "нн", root + "ейшь"))
+
+    return list(dict.fromkeys(word for word in words if word))
+
+
+def load_reference():
+    with gzip.open(REFERENCE_PATH, "rt", encoding="utf-8") as stream:
+        return [line.rstrip("\n").split("\t") for line in stream]
+
+
+def write_reference(stemmer):
+    with gzip.open(REFERENCE_PATH, "wt", encoding="utf-8") as stream:
+        for word in generate_words():
+            stream.write("%s\t%s\n" % (word, stemmer.stem(word)))
+
+
+class RussianStemmerTest(unittest.TestCase):
+
+    def test_matches_reference(self):
+        stemmer = RussianStemmer()
+        reference = load_reference()
+        self.assertGreater(len(reference), 10000)
+        differences = [(word, stem, stemmer.stem(word)) for word, stem in reference if stemmer.stem(word) != stem]
+        self.assertEqual(differences[:20], [], "%d words differ" % len(differences))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--write-reference"]:
+        write_reference(RussianStemmer())
+    else:
+        unittest.main()
@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+from .Keywords import INCLUDING_FILTER, WINDOW_SIZE
+from .Keywords import _rank_keywords
+from .PageRankWeighted import get_pagerank_engine as _get_pagerank_engine
+from .Stats import measure as _measure
+from .Summarizer import _build_sentence_graph, _collect_stats, _get_stem_cache_info, _rank_sentence_graph
+from .Utils.TextCleaner import get_text_cleaner as _get_text_cleaner
+
+TextAnalysis = namedtuple("TextAnalysis", ["document", "keywords"])
+
+
+def analyze(text, language, keyword_ratio=0.2, keyword_words=None, split=False, scores=False,
+            window=WINDOW_SIZE, pos_filter=INCLUDING_FILTER, engine="sparse", additional_stopwords=None,
+            cleaner=None, vocabulary=None, stats=None, lsh=None, sparsify=None):
+    """
+    Ранжирует предложения и ключевые слова текста за один проход обработки:
+    текст делится на предложения, приводится к нижнему регистру и
+    стеммируется один раз, и из тех же основ строятся граф сходства
+    предложений и граф совместной встречаемости слов.
+    Возвращает TextAnalysis: RankedDocument предложений (резюме любой длины
+    получается через document.summary) и ключевые слова в том же виде, что
+    и у Keywords.keywords.
+    """
+    if not isinstance(text, str):
+        raise ValueError("Text parameter must be a Unicode object (str)!")
+
+    pagerank = _get_pagerank_engine(engine)
+
+    if cleaner is None:
+        cleaner = _get_text_cleaner(language, additional_stopwords)
+
+    if stats is not None:
+        stem_cache_info = _get_stem_cache_info(cleaner)
+
+    sentences, split_text, words = cleaner.clean_text_by_sentences_and_words(text, vocabulary, stats)
+
+    graph = _build_sentence_graph(sentences, stats, lsh, sparsify)
+    if stats is not None:
+        _collect_stats(stats, cleaner, stem_cache_info, sentences, graph)
+    document = _rank_sentence_graph(sentences, graph, pagerank, stats)
+
+    # Счётчики stats относятся к графу предложений, ключевые слова замеряются одним этапом.
+    with _measure(stats, "keywords"):
+        keywords = _rank_keywords(split_text, words, pagerank, keyword_ratio, keyword_words, split, scores, window,
+                                  pos_filter)
+
+    return TextAnalysis(document, keywords)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from threading import Lock
+
+from .Parallel import SummaryPool
+from .Summarizer import summarize as _summarize
+
+_default_executor = None
+_default_executor_lock = Lock()
+
+
+def _get_default_executor():
+    # Обработка текста написана на Python и держит GIL, поэтому по умолчанию
+    # используются процессы, а не пул потоков цикла событий.
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = ProcessPoolExecutor(os.cpu_count() or 1)
+        return _default_executor
+
+
+def _submit(executor, text, language, parameters):
+    if isinstance(executor, SummaryPool):
+        return executor.submit(text, language, **parameters)
+    return (executor or _get_default_executor()).submit(partial(_summarize, text, language, **parameters))
+
+
+def _release_when_done(future, semaphore, loop):
+    # Место освобождается, только когда исполнитель закончил работу: брошенный
+    # по тайм-ауту документ продолжает занимать поток или процесс.
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # Цикл событий уже закрыт.
+
+    future.add_done_callback(release)
+
+
+async def summarize_async(text, language, ratio=0.2, words=None, split=False, scores=False, engine="sparse",
+                          additional_stopwords=None, knapsack=False, executor=None, timeout=None, semaphore=None):
+    """
+    Асинхронный вариант summarize: обработка текста и ранжирование
+    выполняются в исполнителе, цикл событий не блокируется.
+    @param executor: ThreadPoolExecutor, ProcessPoolExecutor или SummaryPool;
+     по умолчанию - общий ProcessPoolExecutor модуля. Потоки подходят мало:
+     обработка текста держит GIL.
+    @param timeout: Предельное время в секундах, после которого выбрасывается asyncio.TimeoutError.
+     Уже начатый документ дорабатывает в исполнителе, но его результат не ждут.
+    @param semaphore: asyncio.Semaphore, ограничивающий число одновременных вызовов.
+     Место освобождается по окончании работы исполнителя, а не по тайм-ауту.
+    """
+    if not isinstance(text, str):
+        raise ValueError("Text parameter must be a Unicode object (str)!")
+
+    parameters = dict(ratio=ratio, words=words, split=split, scores=scores, engine=engine,
+                      additional_stopwords=additional_stopwords, knapsack=knapsack)
+
+    # Время ожидания семафора не входит в timeout.
+    if semaphore is not None:
+        await semaphore.acquire()
+    try:
+        future = _submit(executor, text, language, parameters)
+    except BaseException:
+        if semaphore is not None:
+            semaphore.release()
+        raise
+    if semaphore is not None:
+        _release_when_done(future, semaphore, asyncio.get_running_loop())
+
+    # При отмене или истечении времени задача снимается с очереди исполнителя, если ещё не начата.
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+
+async def summarize_many_async(texts, language, ratio=0.2, words=None, split=False, scores=False,
+                               engine="sparse", additional_stopwords=None, knapsack=False, executor=None,
+                               timeout=None, concurrency=None, return_exceptions=False):
+    """
+    Резюмирует тексты конкурентно, не более concurrency одновременно
+    (по умолчанию - число процессоров). Возвращает результаты в порядке texts.
+    timeout действует на каждый документ отдельно. При return_exceptions=True
+    ошибки и истечения времени возвращаются вместо результатов, иначе первая
+    из них отменяет остальные документы.
+    """
+    semaphore = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+    tasks = [asyncio.ensure_future(summarize_async(text, language, ratio, words, split, scores, engine,
+                                                   additional_stopwords, knapsack, executor, timeout, semaphore))
+             for text in texts]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+from .Summarizer import summarize as _summarize
+
+# Увеличивается при любом изменении, которое меняет результаты summarize.
+# Записи других версий не используются и удаляются purge_stale.
+ALGORITHM_VERSION = "1"
+
+SUMMARY_CACHE_SIZE = 1024
+
+SummaryCacheInfo = namedtuple("SummaryCacheInfo",
+                              ["hits", "disk_hits", "misses", "evictions", "maxsize", "currsize"])
+
+# Параметры summarize, влияющие на результат и входящие в ключ кэша.
+KEY_PARAMETERS = ("ratio", "words", "split", "scores", "engine", "knapsack")
+
+_MISSING = object()
+
+
+class SummaryCache(object):
+    """
+    Кэш результатов summarize с адресацией по содержимому: ключ - хеш текста,
+    языка, стоп-слов, параметров и версии алгоритма.
+    Первый уровень - ограниченный LRU в памяти, второй (необязательный) -
+    база SQLite на локальном диске, общая для нескольких процессов.
+    """
+
+    def __init__(self, maxsize=SUMMARY_CACHE_SIZE, path=None, version=ALGORITHM_VERSION):
+        self.maxsize = maxsize
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._lock = Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            # WAL позволяет нескольким процессам читать, пока один пишет.
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS summaries ("
+                                     "key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+                                     "value TEXT NOT NULL, created REAL NOT NULL)")
+            self._connection.commit()
+
+    def key(self, text, language, additional_stopwords=None, **parameters):
+        """Возвращает ключ кэша для вызова summarize с данными аргументами."""
+        unknown = set(parameters) - set(KEY_PARAMETERS)
+        if unknown:
+            raise ValueError("Parameters can not be cached: " + ", ".join(sorted(unknown)))
+
+        description = {
+            "version": self.version,
+            "language": language,
+            "stopwords": sorted(w for w in additional_stopwords or () if w),
+            "parameters": {name: parameters[name] for name in sorted(parameters)},
+        }
+        digest = hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _copy(self._memory[key])
+
+            value = self._load(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            self.disk_hits += 1
+            self._remember(key, value)
+            return _copy(value)
+
+    def set(self, key, value):
+        with self._lock:
+            self._remember(key, _copy(value))
+            if self._connection is not None:
+                self._connection.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                                         (key, self.version, json.dumps(value, ensure_ascii=False), time.time()))
+                self._connection.commit()
+
+    def summarize(self, text, language, ratio=0.2, words=None, split=False, scores=False, engine="sparse",
+                  additional_stopwords=None, knapsack=False):
+        """ Возвращает результат Summarizer.summarize из кэша или вычисляет и сохраняет его. """
+        if not isinstance(text, str):
+            raise ValueError("Text parameter must be a Unicode object (str)!")
+
+        parameters = dict(ratio=ratio, words=words, split=split, scores=scores, engine=engine, knapsack=knapsack)
+        key = self.key(text, language, additional_stopwords, **parameters)
+        result = self.get(key, _MISSING)
+        if result is _MISSING:
+            result = _summarize(text, language, additional_stopwords=additional_stopwords, **parameters)
+            if scores:
+                result = [(sentence, float(score)) for sentence, score in result]
+            self.set(key, result)
+        return result
+
+    def invalidate(self):
+        """Очищает память и удаляет с диска все записи."""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM summaries")
+                self._connection.commit()
+
+    def purge_stale(self):
+        """Удаляет с диска записи других версий алгоритма."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM summaries WHERE version != ?", (self.version,))
+                self._connection.commit()
+
+    def cache_info(self):
+        with self._lock:
+            return SummaryCacheInfo(self.hits, self.disk_hits, self.misses, self.evictions,
+                                    self.maxsize, len(self._memory))
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    # Вспомогательные методы
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if self.maxsize is not None and len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key):
+        if self._connection is None:
+            return _MISSING
+
+        row = self._connection.execute("SELECT value FROM summaries WHERE key = ? AND version = ?",
+                                       (key, self.version)).fetchone()
+        if row is None:
+            return _MISSING
+
+        value = json.loads(row[0])
+        # JSON не различает кортежи и списки; пары (предложение, оценка) восстанавливаются.
+        if isinstance(value, list) and value and isinstance(value[0], list):
+            value = [tuple(item) for item in value]
+        return value
+
+
+def _copy(value):
+    # Списки предложений копируются, чтобы изменения у вызывающего не портили
+    # память кэша; элементы - строки и кортежи, они неизменяемы.
+    return list(value) if isinstance(value, list) else value
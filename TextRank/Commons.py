@@ -1,11 +1,11 @@
-from .Graph import Graph
+from .Graph import Graph, ArrayGraph
 import numpy
 import math
 
 epsilon = 1e-4
 
-def build_graph(sequence):
-    graph = Graph()
+def build_graph(sequence, graph_class=Graph):
+    graph = graph_class()
     for item in sequence:
         if not graph.has_node(item):
             graph.add_node(item)
@@ -13,6 +13,14 @@ def build_graph(sequence):
 
 
 def remove_unreachable_nodes(graph):
+    if isinstance(graph, ArrayGraph):
+        # Суммы весов считаются сразу по всей матрице смежности.
+        weight_sums = graph.to_csr_matrix().sum(axis=1).A1
+        for node, weight_sum in zip(graph.nodes(), weight_sums):
+            if weight_sum == 0:
+                graph.del_node(node)
+        return
+
     for node in graph.nodes():
         if sum(graph.edge_weight((node, other)) for other in graph.neighbors(node)) == 0:
             graph.del_node(node)
@@ -1,4 +1,8 @@
 from abc import ABCMeta, abstractmethod
+from array import array
+
+import numpy
+from scipy.sparse import csr_matrix
 
 
 class IGraph(metaclass=ABCMeta):
@@ -212,3 +216,218 @@ class Graph(IGraph):
                     del (mapping[key])
                 except KeyError:
                     pass
+
+
+class ArrayGraph(IGraph):
+    """
+    Компактная реализация неориентированного графа на массивах NumPy.
+    Узлы получают целочисленные идентификаторы, рёбра хранятся в формате CSR:
+    соседи узла - срез массива индексов, веса - массив float64.
+    Словари свойств для рёбер не создаются, метки рёбер не сохраняются.
+    """
+
+    DEFAULT_WEIGHT = 0
+
+    def __init__(self):
+        # Метаданные узлов
+        self.node_attr = {}  # Pairing: Node -> Attributes (только непустые)
+        self._nodes = []  # Идентификатор -> узел
+        self._node_ids = {}  # Узел -> идентификатор
+        self._alive = bytearray()  # Идентификатор -> 1, если узел не удалён
+        self._removed_nodes = 0
+
+        # Рёбра в формате CSR, каждое ребро хранится в обеих строках.
+        self._indptr = numpy.zeros(1, dtype=numpy.int32)
+        self._indices = numpy.zeros(0, dtype=numpy.int32)
+        self._weights = numpy.zeros(0, dtype=numpy.float64)
+
+        # Изменения рёбер после последней сборки CSR в формате COO.
+        self._pending_rows = array('i')
+        self._pending_cols = array('i')
+        self._pending_weights = array('d')
+        self._pending_edges = set()  # Пары идентификаторов (min, max)
+        self._removed_edges = set()  # Пары идентификаторов (min, max)
+
+    def has_edge(self, edge):
+        u, v = edge
+        if u not in self._node_ids or v not in self._node_ids:
+            return False
+
+        i, j = self._node_ids[u], self._node_ids[v]
+        key = (min(i, j), max(i, j))
+        if key in self._pending_edges:
+            return True
+        if key in self._removed_edges:
+            return False
+        return self._position(i, j) >= 0
+
+    def edge_weight(self, edge):
+        u, v = edge
+        if u not in self._node_ids or v not in self._node_ids:
+            return self.DEFAULT_WEIGHT
+
+        self._compile()
+        position = self._position(self._node_ids[u], self._node_ids[v])
+        if position < 0:
+            return self.DEFAULT_WEIGHT
+        return float(self._weights[position])
+
+    def neighbors(self, node):
+        i = self._node_ids[node]
+        self._compile()
+        neighbor_ids = self._indices[self._indptr[i]:self._indptr[i + 1]].tolist()
+        if self._removed_nodes:
+            return [self._nodes[j] for j in neighbor_ids if self._alive[j]]
+        return [self._nodes[j] for j in neighbor_ids]
+
+    def has_node(self, node):
+        return node in self._node_ids
+
+    def add_edge(self, edge, wt=1, label=''):
+        u, v = edge
+        if self.has_edge(edge):
+            raise ValueError("Edge (%s, %s) already in graph" % (u, v))
+
+        i, j = self._node_ids[u], self._node_ids[v]
+        self._pending_rows.append(i)
+        self._pending_cols.append(j)
+        self._pending_weights.append(wt)
+        self._pending_edges.add((min(i, j), max(i, j)))
+
+    def add_node(self, node, attrs=None):
+        if node in self._node_ids:
+            raise ValueError("Node %s already in graph" % node)
+
+        self._node_ids[node] = len(self._nodes)
+        self._nodes.append(node)
+        self._alive.append(1)
+        if attrs:
+            self.node_attr[node] = attrs
+
+    def nodes(self):
+        if self._removed_nodes:
+            return [node for i, node in enumerate(self._nodes) if self._alive[i]]
+        return list(self._nodes)
+
+    def edges(self):
+        self._compile(compact=True)
+        rows = numpy.repeat(numpy.arange(len(self._nodes)), numpy.diff(self._indptr))
+        return [(self._nodes[i], self._nodes[j]) for i, j in zip(rows.tolist(), self._indices.tolist())]
+
+    def del_node(self, node):
+        i = self._node_ids.pop(node)
+        self._alive[i] = 0
+        self._removed_nodes += 1
+        self.node_attr.pop(node, None)
+
+    def del_edge(self, edge):
+        u, v = edge
+        if not self.has_edge(edge):
+            raise ValueError("Edge (%s, %s) not in graph" % (u, v))
+
+        i, j = self._node_ids[u], self._node_ids[v]
+        key = (min(i, j), max(i, j))
+        if key in self._pending_edges:
+            self._compile()
+        self._removed_edges.add(key)
+
+    def set_adjacency_matrix(self, matrix):
+        """
+        Заменяет все рёбра графа симметричной матрицей весов.
+        Строки и столбцы матрицы соответствуют узлам в порядке nodes().
+        Массивы матрицы используются без копирования.
+        @type  matrix: csr_matrix
+        @param matrix: Симметричная матрица весов.
+        """
+        self._compile(compact=True)
+        dimension = len(self._nodes)
+        if matrix.shape != (dimension, dimension):
+            raise ValueError("Matrix shape %s does not match %d nodes" % (matrix.shape, dimension))
+
+        matrix.sum_duplicates()
+        self._indptr = matrix.indptr
+        self._indices = matrix.indices
+        self._weights = matrix.data
+
+    def to_csr_matrix(self):
+        """
+        Возвращает матрицу весов графа в порядке nodes().
+        Если после последней сборки не было изменений, матрица разделяет
+        массивы с графом без копирования.
+        @rtype:  csr_matrix
+        @return: Симметричная матрица весов.
+        """
+        self._compile(compact=True)
+        dimension = len(self._nodes)
+        return csr_matrix((self._weights, self._indices, self._indptr), shape=(dimension, dimension), copy=False)
+
+    # Вспомогательные методы
+    def _position(self, i, j):
+        """
+        Возвращает позицию ребра (i, j) в массивах CSR или -1, если его нет.
+        """
+        if i >= len(self._indptr) - 1 or not self._alive[i] or not self._alive[j]:
+            return -1
+
+        start, end = self._indptr[i], self._indptr[i + 1]
+        position = start + numpy.searchsorted(self._indices[start:end], j)
+        if position < end and self._indices[position] == j:
+            return int(position)
+        return -1
+
+    def _compile(self, compact=False):
+        """
+        Переносит отложенные изменения рёбер в массивы CSR.
+        При compact=True также удаляет из массивов удалённые узлы и
+        перенумеровывает оставшиеся.
+        """
+        dimension = len(self._nodes)
+        if not (self._pending_edges or self._removed_edges or len(self._indptr) - 1 != dimension
+                or (compact and self._removed_nodes)):
+            return
+
+        current_dimension = len(self._indptr) - 1
+        rows = numpy.repeat(numpy.arange(current_dimension, dtype=numpy.int32), numpy.diff(self._indptr))
+        cols = self._indices
+        weights = self._weights
+
+        if self._removed_edges:
+            keep = numpy.ones(len(cols), dtype=bool)
+            for i, j in self._removed_edges:
+                for position in (self._position(i, j), self._position(j, i)):
+                    if position >= 0:
+                        keep[position] = False
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+        if self._pending_edges:
+            pending_rows = numpy.frombuffer(self._pending_rows, dtype=numpy.int32)
+            pending_cols = numpy.frombuffer(self._pending_cols, dtype=numpy.int32)
+            pending_weights = numpy.frombuffer(self._pending_weights, dtype=numpy.float64)
+            off_diagonal = pending_rows != pending_cols
+            rows = numpy.concatenate((rows, pending_rows, pending_cols[off_diagonal]))
+            cols = numpy.concatenate((cols, pending_cols, pending_rows[off_diagonal]))
+            weights = numpy.concatenate((weights, pending_weights, pending_weights[off_diagonal]))
+
+        if compact and self._removed_nodes:
+            alive = numpy.frombuffer(self._alive, dtype=numpy.uint8).astype(bool)
+            keep = alive[rows] & alive[cols]
+            new_ids = numpy.cumsum(alive, dtype=numpy.int32) - 1
+            rows, cols, weights = new_ids[rows[keep]], new_ids[cols[keep]], weights[keep]
+
+            self._nodes = [node for i, node in enumerate(self._nodes) if alive[i]]
+            self._node_ids = {node: i for i, node in enumerate(self._nodes)}
+            self._alive = bytearray(b"\x01" * len(self._nodes))
+            self._removed_nodes = 0
+            dimension = len(self._nodes)
+
+        matrix = csr_matrix((weights, (rows, cols)), shape=(dimension, dimension))
+        matrix.sort_indices()
+        self._indptr = matrix.indptr
+        self._indices = matrix.indices
+        self._weights = matrix.data
+
+        self._pending_rows = array('i')
+        self._pending_cols = array('i')
+        self._pending_weights = array('d')
+        self._pending_edges = set()
+        self._removed_edges = set()
@@ -0,0 +1,181 @@
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+
+from .PageRankWeighted import get_pagerank_engine as _get_pagerank_engine
+from .Parallel import PENDING_CHUNKS_PER_PROCESS
+from .Parallel import _init_worker
+from .Similarity import SimilaritySparsifier as _SimilaritySparsifier
+from .Summarizer import RankedDocument as _RankedDocument
+from .Summarizer import _build_sentence_graph
+from .Summarizer import _rank_sentence_graph
+from .Utils.TextCleaner import get_text_cleaner as _get_text_cleaner
+from .Utils.TextCleaner import merge_syntactic_units as _merge_syntactic_units
+from .Utils.TextCleaner import split_sentences as _split_sentences
+from .Utils.Vocabulary import Vocabulary as _Vocabulary
+
+# Наибольшее число предложений в одном графе. Граф порции в худшем случае
+# полный, поэтому память процесса растёт как квадрат этого числа.
+CHUNK_SENTENCES = 2000
+
+# Сколько рёбер на предложение остаётся в последнем графе, если объединение
+# резюме порций не удалось уменьшить до chunk_sentences (например, при большом ratio).
+FINAL_TOP_K = 50
+
+# Во сколько раз больше предложений, чем нужно для итогового резюме,
+# отбирается из порций, чтобы у последнего ранжирования был выбор.
+OVERSAMPLING = 2
+
+# Абзацы разделяются пустой строкой. Предложения не переходят через перевод
+# строки, поэтому номера предложений совпадают с разбиением всего текста.
+RE_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def split_chunks(text, chunk_sentences=CHUNK_SENTENCES):
+    """
+    Разбивает текст на порции не больше chunk_sentences предложений по границам
+    абзацев; слишком длинный абзац делится по границам предложений.
+    Выдаёт списки пар (номер предложения в тексте, предложение).
+    """
+    chunk = []
+    index = 0
+    for paragraph in RE_PARAGRAPH.split(text):
+        sentences = _split_sentences(paragraph)
+        if chunk and len(chunk) + len(sentences) > chunk_sentences:
+            yield chunk
+            chunk = []
+        for sentence in sentences:
+            chunk.append((index, sentence))
+            index += 1
+            if len(chunk) >= chunk_sentences:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _rank_units(units, cleaner, pagerank, length=None, sparsify=None):
+    """ Ранжирует предложения (номер, текст) одним графом; номера сохраняются. """
+    texts = [text for _, text in units]
+    sentences = _merge_syntactic_units(texts, cleaner.tokenize_sentences(texts))
+    vocabulary = _Vocabulary()
+    for sentence in sentences:
+        sentence.set_vocabulary(vocabulary)
+        sentence.index = units[sentence.index][0]
+
+    document = _rank_sentence_graph(sentences, _build_sentence_graph(sentences, sparsify=sparsify), pagerank)
+    return len(sentences), _RankedDocument(document.sentences, length)
+
+
+def _summarize_chunk(units, language, additional_stopwords, engine, ratio, words, knapsack):
+    """ Выполняется в процессе пула. Возвращает число предложений порции и отобранные пары (номер, текст). """
+    cleaner = _get_text_cleaner(language, additional_stopwords)
+    count, document = _rank_units(units, cleaner, _get_pagerank_engine(engine))
+    return count, [(sentence.index, sentence.text) for sentence in document.top(ratio, words, knapsack)]
+
+
+def _map_chunks(executor, max_pending, chunks, arguments):
+    """ Резюмирует порции в пуле, держа в работе не больше max_pending.
+     Возвращает общее число предложений и объединение отобранных, упорядоченное по номеру. """
+    chunks = iter(chunks)
+    pending = set()
+    count = 0
+    selected = []
+    try:
+        while True:
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(_summarize_chunk, chunk, *arguments))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_count, chunk_selected = future.result()
+                count += chunk_count
+                selected.extend(chunk_selected)
+    finally:
+        for future in pending:
+            future.cancel()
+
+    selected.sort()
+    return count, selected
+
+
+def _iter_slices(units, size):
+    for start in range(0, len(units), size):
+        yield units[start:start + size]
+
+
+def rank(text, language, ratio=0.2, words=None, engine="sparse", additional_stopwords=None, knapsack=False,
+         chunk_sentences=CHUNK_SENTENCES, processes=None, executor=None):
+    """
+    Иерархическое ранжирование текста, который не помещается в один граф.
+    Порции по границам абзацев резюмируются в процессах пула, затем
+    объединение их резюме ранжируется заново; пока объединение больше
+    chunk_sentences и уменьшается, шаг повторяется над ним самим.
+    ratio и words нужны заранее: по ним решается, сколько предложений
+    оставить в каждой порции. Если объединение всё же больше chunk_sentences,
+    в последнем графе остаются FINAL_TOP_K рёбер на предложение.
+    Возвращает RankedDocument последнего шага с исходными номерами
+    предложений; ratio отсчитывается от всего текста.
+    Текст из одной порции ранжируется так же, как Summarizer.rank.
+    @param executor: ProcessPoolExecutor или ThreadPoolExecutor; по умолчанию
+     создаётся пул из processes процессов на время вызова.
+    """
+    if not isinstance(text, str):
+        raise ValueError("Text parameter must be a Unicode object (str)!")
+    if chunk_sentences < 1:
+        raise ValueError("chunk_sentences must be positive")
+
+    pagerank = _get_pagerank_engine(engine)
+    cleaner = _get_text_cleaner(language, additional_stopwords)
+
+    chunks = split_chunks(text, chunk_sentences)
+    first = next(chunks, None)
+    second = next(chunks, None)
+    if first is None:
+        return _RankedDocument([])
+    if second is None:
+        return _rank_units(first, cleaner, pagerank)[1]
+
+    own_executor = executor is None
+    if own_executor:
+        processes = processes or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                       initargs=(language, additional_stopwords))
+    max_pending = (processes or os.cpu_count() or 1) * PENDING_CHUNKS_PER_PROCESS
+    try:
+        arguments = (language, additional_stopwords, engine)
+        length, units = _map_chunks(executor, max_pending, chain([first, second], chunks),
+                                    arguments + (min(1.0, OVERSAMPLING * ratio), words, knapsack))
+
+        while len(units) > chunk_sentences:
+            # На следующих уровнях доля рассчитывается от размера объединения.
+            fraction = min(1.0, OVERSAMPLING * int(length * ratio) / len(units))
+            if words is None and fraction >= 1:
+                break
+            _, reduced = _map_chunks(executor, max_pending, _iter_slices(units, chunk_sentences),
+                                     arguments + (fraction, words, knapsack))
+            if len(reduced) >= len(units):
+                break
+            units = reduced
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    sparsify = _SimilaritySparsifier(top_k=FINAL_TOP_K) if len(units) > chunk_sentences else None
+    return _rank_units(units, cleaner, pagerank, length, sparsify)[1]
+
+
+def summarize(text, language, ratio=0.2, words=None, split=False, scores=False, engine="sparse",
+              additional_stopwords=None, knapsack=False, chunk_sentences=CHUNK_SENTENCES, processes=None,
+              executor=None):
+    """ То же, что Summarizer.summarize, но для больших текстов: см. rank. """
+    document = rank(text, language, ratio, words, engine, additional_stopwords, knapsack, chunk_sentences,
+                    processes, executor)
+    return document.summary(ratio, words, split, scores, knapsack)
@@ -0,0 +1,188 @@
+import heapq
+
+import numpy
+from scipy.sparse import coo_matrix, csr_matrix
+
+from .PageRankWeighted import get_pagerank_engine as _get_pagerank_engine
+from .Utils.TextCleaner import get_text_cleaner as _get_text_cleaner
+from .Utils.TextCleaner import tokenize_by_word as _tokenize_by_word
+from .Commons import build_graph as _build_graph
+from .Commons import remove_unreachable_nodes as _remove_unreachable_nodes
+from .Graph import ArrayGraph as _ArrayGraph
+from .Stats import measure as _measure
+
+# Слова соединяются ребром, если расстояние между ними в тексте меньше окна.
+WINDOW_SIZE = 2
+
+# Части речи, слова которых попадают в граф (если доступен pattern).
+INCLUDING_FILTER = ("NN", "JJ")
+
+# Сколько позиций текста обрабатывается за раз при построении матрицы.
+COOCCURRENCE_BLOCK_SIZE = 1 << 20
+
+
+def build_cooccurrence_matrix(positions, size, window=WINDOW_SIZE):
+    """
+    Строит матрицу совместной встречаемости слов.
+    Элемент (a, b) равен 1, если слова a и b встречаются в тексте на
+    расстоянии меньше window. Текст обрабатывается блоками, поэтому
+    память определяется числом различных пар слов, а не длиной текста.
+    @type  positions: numpy.ndarray
+    @param positions: Номер узла для каждого слова текста, -1 для пропущенных слов.
+    @type  size: int
+    @param size: Число узлов.
+    @rtype:  csr_matrix
+    @return: Симметричная бинарная матрица с нулевой диагональю.
+    """
+    matrix = csr_matrix((size, size))
+    for start in range(0, max(len(positions) - 1, 0), COOCCURRENCE_BLOCK_SIZE):
+        # Блок захватывает window - 1 слов следующего блока, чтобы не потерять пары на стыке.
+        block = positions[start:start + COOCCURRENCE_BLOCK_SIZE + window - 1]
+        rows = []
+        cols = []
+        for distance in range(1, window):
+            first = block[:-distance]
+            second = block[distance:]
+            mask = (first >= 0) & (second >= 0) & (first != second)
+            rows.append(first[mask])
+            cols.append(second[mask])
+        rows = numpy.concatenate(rows)
+        cols = numpy.concatenate(cols)
+        block_matrix = coo_matrix((numpy.ones(len(rows)), (rows, cols)), shape=(size, size)).tocsr()
+        matrix = matrix + block_matrix + block_matrix.T
+
+    # Ребро не зависит от числа совместных вхождений.
+    matrix.data[:] = 1
+    matrix.sort_indices()
+    return matrix
+
+
+def _get_words_for_graph(tokens, pos_filter):
+    """ Возвращает словарь слово -> основа для слов, проходящих фильтр частей речи.
+     Слова без тега проходят всегда. """
+    return {word: unit.token for word, unit in tokens.items()
+            if not pos_filter or not unit.tag or unit.tag in pos_filter}
+
+
+def _build_cooccurrence_graph(split_text, lemmas_by_word, window):
+    # Основы нумеруются в порядке первого появления, каждое слово текста
+    # заменяется номером своей основы.
+    lemma_ids = {}
+    word_ids = {word: lemma_ids.setdefault(lemma, len(lemma_ids)) for word, lemma in lemmas_by_word.items()}
+    positions = numpy.fromiter((word_ids.get(word, -1) for word in split_text), dtype=numpy.int32,
+                               count=len(split_text))
+
+    graph = _build_graph(lemma_ids, _ArrayGraph)
+    graph.set_adjacency_matrix(build_cooccurrence_matrix(positions, len(lemma_ids), window))
+    return graph
+
+
+def _extract_tokens(graph, scores, ratio, words):
+    lemmas = graph.nodes()
+    length = len(lemmas) * ratio if words is None else words
+    # Частичный выбор с тем же порядком, что и sorted(..., reverse=True)[:k].
+    return heapq.nlargest(int(length), lemmas, key=scores.get)
+
+
+def _get_keywords_with_score(extracted_lemmas, lemmas_by_word, scores):
+    extracted = set(extracted_lemmas)
+    return {word: scores[lemma] for word, lemma in lemmas_by_word.items() if lemma in extracted}
+
+
+def _get_combined_keywords(keywords, split_text):
+    """ Объединяет ключевые слова, стоящие в тексте подряд, в фразы.
+     Каждое слово входит только в первую фразу, где оно встретилось. """
+    result = []
+    remaining = set(keywords)
+    phrase = []
+    for word in split_text:
+        if word in remaining and word not in phrase:
+            phrase.append(word)
+            continue
+
+        if phrase:
+            result.append(" ".join(phrase))
+            remaining.difference_update(phrase)
+            phrase = []
+        if word in remaining:
+            phrase.append(word)
+
+    if phrase:
+        result.append(" ".join(phrase))
+    return result
+
+
+def _get_average_score(phrase, keywords):
+    words = phrase.split()
+    return sum(keywords[word] for word in words) / len(words)
+
+
+def _format_results(keywords, combined_keywords, split, scores):
+    combined_keywords.sort(key=lambda phrase: _get_average_score(phrase, keywords), reverse=True)
+    if scores:
+        return [(phrase, _get_average_score(phrase, keywords)) for phrase in combined_keywords]
+    if split:
+        return combined_keywords
+    return "\n".join(combined_keywords)
+
+
+def keywords(text, language, ratio=0.2, words=None, split=False, scores=False, window=WINDOW_SIZE,
+             pos_filter=INCLUDING_FILTER, engine="sparse", deacc=False, additional_stopwords=None, cleaner=None,
+             stats=None):
+    """
+    Извлекает ключевые слова и фразы текста.
+    Основы слов ранжируются PageRank на графе совместной встречаемости,
+    затем ключевые слова, стоящие в тексте подряд, объединяются в фразы.
+    Результат имеет тот же вид, что и у summarize: строки через перевод
+    строки, список (split=True) или пары (фраза, оценка) (scores=True).
+    """
+    if not isinstance(text, str):
+        raise ValueError("Text parameter must be a Unicode object (str)!")
+    _check_window(window)
+
+    pagerank = _get_pagerank_engine(engine)
+
+    if cleaner is None:
+        cleaner = _get_text_cleaner(language, additional_stopwords)
+
+    # Текст разбивается на слова один раз, основы считаются по уникальным словам.
+    with _measure(stats, "tokenize_by_word"):
+        split_text = list(_tokenize_by_word(text, deacc))
+    with _measure(stats, "clean_words"):
+        tokens = cleaner.clean_words(split_text)
+
+    return _rank_keywords(split_text, tokens, pagerank, ratio, words, split, scores, window, pos_filter, stats)
+
+
+def _check_window(window):
+    # Окно из одного слова не даёт ни одной пары, граф был бы пустым.
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+
+def _rank_keywords(split_text, tokens, pagerank, ratio, words, split, scores, window, pos_filter, stats=None):
+    _check_window(window)
+    lemmas_by_word = _get_words_for_graph(tokens, pos_filter)
+    with _measure(stats, "_build_cooccurrence_graph"):
+        graph = _build_cooccurrence_graph(split_text, lemmas_by_word, window)
+
+    with _measure(stats, "remove_unreachable_nodes"):
+        _remove_unreachable_nodes(graph)
+
+    if stats is not None:
+        stats.nodes = len(graph.nodes())
+        stats.edges = graph.to_csr_matrix().nnz // 2
+        stats.vocabulary_size = len(tokens)
+
+    # PageRank не может работать в пустом графе.
+    if len(graph.nodes()) == 0:
+        return _format_results({}, [], split, scores)
+
+    with _measure(stats, "_pagerank"):
+        pagerank_scores = pagerank(graph, stats=stats)
+
+    extracted_lemmas = _extract_tokens(graph, pagerank_scores, ratio, words)
+    keyword_scores = _get_keywords_with_score(extracted_lemmas, lemmas_by_word, pagerank_scores)
+    combined_keywords = _get_combined_keywords(keyword_scores, split_text)
+
+    return _format_results(keyword_scores, combined_keywords, split, scores)
@@ -0,0 +1,120 @@
+import numpy
+from scipy.sparse import csr_matrix
+
+from .Similarity import build_incidence_matrix_from_ids
+
+# Простое число Мерсенна 2^31 - 1 для хеш-функций вида (a * x + b) mod p.
+MERSENNE_PRIME = (1 << 31) - 1
+
+LSH_BANDS = 32
+LSH_ROWS = 2
+LSH_MAX_BUCKET_SIZE = 32
+
+# Множитель для свёртки строк полосы в один ключ корзины.
+_BAND_MULTIPLIER = numpy.uint64(0x9E3779B97F4A7C15)
+
+
+class MinHashLSH(object):
+    """
+    Приближённое построение графа сходства предложений.
+    Для каждого предложения считается MinHash-подпись из bands * rows
+    значений; предложения, у которых совпала хотя бы одна полоса из rows
+    значений, становятся парой-кандидатом. Точный вес, как в
+    Similarity.build_similarity_matrix, считается только для кандидатов.
+
+    Вероятность, что пара с мерой Жаккара J станет кандидатом, равна
+    1 - (1 - J^rows)^bands: больше bands - выше полнота и больше пар,
+    больше rows - меньше случайных кандидатов. max_bucket_size ограничивает
+    число пар из одной корзины: каждое предложение соединяется не более
+    чем с max_bucket_size - 1 соседями по корзине.
+    """
+
+    def __init__(self, bands=LSH_BANDS, rows=LSH_ROWS, max_bucket_size=LSH_MAX_BUCKET_SIZE, seed=0):
+        if bands < 1 or rows < 1 or max_bucket_size < 2:
+            raise ValueError("bands and rows must be positive and max_bucket_size at least 2")
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket_size = max_bucket_size
+        self.seed = seed
+        generator = numpy.random.RandomState(seed)
+        self._a = generator.randint(1, MERSENNE_PRIME, size=bands * rows).astype(numpy.int64)
+        self._b = generator.randint(0, MERSENNE_PRIME, size=bands * rows).astype(numpy.int64)
+
+    def signatures(self, ids):
+        """
+        Возвращает MinHash-подписи предложений, массив (число предложений, bands * rows).
+        У пустых предложений подпись состоит из MERSENNE_PRIME и ни с чем не совпадает.
+        """
+        lengths = numpy.array([len(sentence_ids) for sentence_ids in ids], dtype=numpy.int64)
+        signatures = numpy.full((len(ids), self.bands * self.rows), MERSENNE_PRIME, dtype=numpy.int64)
+        non_empty = numpy.flatnonzero(lengths)
+        if len(non_empty) == 0:
+            return signatures
+
+        flat_ids = numpy.concatenate([numpy.frombuffer(ids[i], dtype=numpy.uint32) for i in non_empty])
+        flat_ids = flat_ids.astype(numpy.int64)
+        starts = numpy.concatenate(([0], numpy.cumsum(lengths[non_empty])[:-1]))
+        for k in range(self.bands * self.rows):
+            hashes = (self._a[k] * flat_ids + self._b[k]) % MERSENNE_PRIME
+            signatures[non_empty, k] = numpy.minimum.reduceat(hashes, starts)
+        return signatures
+
+    def candidate_pairs(self, ids):
+        """ Возвращает массивы (i, j), i < j, пар-кандидатов без повторов. """
+        signatures = self.signatures(ids).astype(numpy.uint64)
+        length = len(ids)
+        empty = signatures[:, 0] == MERSENNE_PRIME
+
+        pair_codes = []
+        for band in range(self.bands):
+            keys = numpy.zeros(length, dtype=numpy.uint64)
+            for column in signatures[:, band * self.rows:(band + 1) * self.rows].T:
+                keys = keys * _BAND_MULTIPLIER + column
+
+            # Предложения одной корзины после сортировки стоят подряд,
+            # пары ищутся сдвигом отсортированного массива на offset позиций.
+            order = numpy.argsort(keys, kind="stable")
+            order = order[~empty[order]]
+            sorted_keys = keys[order]
+            for offset in range(1, self.max_bucket_size):
+                same = sorted_keys[:-offset] == sorted_keys[offset:]
+                if not same.any():
+                    break
+                first = order[:-offset][same]
+                second = order[offset:][same]
+                pair_codes.append(numpy.minimum(first, second) * length + numpy.maximum(first, second))
+
+        if not pair_codes:
+            return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+        # Сортировка с отбрасыванием соседних повторов быстрее numpy.unique на больших массивах.
+        codes = numpy.concatenate(pair_codes)
+        codes.sort()
+        codes = codes[numpy.concatenate(([True], codes[1:] != codes[:-1]))]
+        return codes // length, codes % length
+
+    def build_similarity_matrix(self, ids, vocabulary_size=None):
+        """
+        То же, что Similarity.build_similarity_matrix_from_ids, но веса
+        считаются только для пар-кандидатов LSH.
+        @rtype:  csr_matrix
+        @return: Симметричная матрица весов с нулевой диагональю и без явных нулей.
+        """
+        length = len(ids)
+        rows, cols = self.candidate_pairs(ids)
+
+        incidence = build_incidence_matrix_from_ids(ids, vocabulary_size)
+        common = numpy.asarray(incidence[rows].multiply(incidence[cols]).sum(axis=1)).ravel()
+
+        lengths = numpy.array([len(sentence_ids) for sentence_ids in ids], dtype=numpy.float64)
+        log_lengths = numpy.log10(numpy.maximum(lengths, 1))
+        norm = log_lengths[rows] + log_lengths[cols]
+
+        # Пары из двух однословных предложений имеют нулевой вес.
+        weights = numpy.zeros(len(rows))
+        numpy.divide(common, norm, out=weights, where=norm != 0)
+
+        upper = csr_matrix((weights, (rows, cols)), shape=(length, length))
+        upper.eliminate_zeros()
+        similarity = (upper + upper.T).tocsr()
+        similarity.sort_indices()
+        return similarity
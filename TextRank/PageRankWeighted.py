@@ -1,11 +1,16 @@
-from scipy.sparse import csr_matrix
+from scipy.sparse import csr_matrix, diags
 from scipy.linalg import eig
 from numpy import empty as empty_matrix
+import numpy
+
+from .Graph import ArrayGraph
 
 CONVERGENCE_THRESHOLD = 0.0001
+SPARSE_CONVERGENCE_THRESHOLD = 1e-10
+SPARSE_MAX_ITERATIONS = 200
 
 
-def pagerank_weighted(graph, initial_value=None, damping=0.85):
+def pagerank_weighted(graph, initial_value=None, damping=0.85, stats=None):
     """Рассчитывает PageRank для неориентированного графа"""
     if initial_value is None: initial_value = 1.0 / len(graph.nodes())
     scores = dict.fromkeys(graph.nodes(), initial_value)
@@ -14,13 +19,16 @@ def pagerank_weighted(graph, initial_value=None, damping=0.85):
     for iteration_number in range(100):
         iteration_quantity += 1
         convergence_achieved = 0
+        max_change = 0
         for i in graph.nodes():
             rank = 1 - damping
             for j in graph.neighbors(i):
                 neighbors_sum = sum(graph.edge_weight((j, k)) for k in graph.neighbors(j))
                 rank += damping * scores[j] * graph.edge_weight((j, i)) / neighbors_sum
 
-            if abs(scores[i] - rank) <= CONVERGENCE_THRESHOLD:
+            change = abs(scores[i] - rank)
+            max_change = max(max_change, change)
+            if change <= CONVERGENCE_THRESHOLD:
                 convergence_achieved += 1
 
             scores[i] = rank
@@ -28,10 +36,13 @@ def pagerank_weighted(graph, initial_value=None, damping=0.85):
         if convergence_achieved == len(graph.nodes()):
             break
 
+    if stats is not None:
+        stats.pagerank_iterations = iteration_quantity
+        stats.pagerank_residual = max_change
     return scores
 
 
-def pagerank_weighted_scipy(graph, damping=0.85):
+def pagerank_weighted_scipy(graph, damping=0.85, stats=None):
     adjacency_matrix = build_adjacency_matrix(graph)
     probability_matrix = build_probability_matrix(graph)
 
@@ -40,18 +51,67 @@ def pagerank_weighted_scipy(graph, damping=0.85):
     return process_results(graph, vecs)
 
 
+def pagerank_weighted_sparse(graph, damping=0.85, tolerance=SPARSE_CONVERGENCE_THRESHOLD,
+                             max_iterations=SPARSE_MAX_ITERATIONS, stats=None):
+    """
+    Рассчитывает PageRank степенным методом прямо на разреженной матрице смежности.
+    Слагаемое телепортации (1 - damping) / n учитывается неявно как одноранговая
+    поправка, поэтому плотная матрица n × n не строится. Результат совпадает
+    с собственным вектором из pagerank_weighted_scipy с точностью до tolerance.
+    """
+    adjacency_matrix = build_adjacency_matrix(graph)
+    vector = power_iteration(adjacency_matrix, damping, tolerance, max_iterations, stats)
+    return process_results(graph, vector.reshape(-1, 1))
+
+
+def power_iteration(adjacency_matrix, damping=0.85, tolerance=SPARSE_CONVERGENCE_THRESHOLD,
+                    max_iterations=SPARSE_MAX_ITERATIONS, stats=None):
+    """
+    Находит левый главный собственный вектор матрицы
+    damping * adjacency_matrix + (1 - damping) / n * ones.
+    Возвращает вектор с единичной евклидовой нормой, как scipy.linalg.eig.
+    """
+    dimension = adjacency_matrix.shape[0]
+    transposed_matrix = adjacency_matrix.T.tocsr()
+    teleport = (1 - damping) / dimension
+
+    vector = numpy.full(dimension, 1.0 / dimension)
+    residual = None
+    iteration_number = -1
+    for iteration_number in range(max_iterations):
+        next_vector = damping * transposed_matrix.dot(vector) + teleport * vector.sum()
+        next_vector /= next_vector.sum()
+
+        residual = numpy.abs(next_vector - vector).sum()
+        vector = next_vector
+        if residual <= tolerance:
+            break
+
+    if stats is not None:
+        stats.pagerank_iterations = iteration_number + 1
+        stats.pagerank_residual = float(residual) if residual is not None else None
+    return vector / numpy.linalg.norm(vector)
+
+
 def build_adjacency_matrix(graph):
+    if isinstance(graph, ArrayGraph):
+        return _build_adjacency_matrix_from_arrays(graph)
+
     row = []
     col = []
     data = []
     nodes = graph.nodes()
     length = len(nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
 
+    # Обходятся только соседи узла, а не все пары узлов.
     for i in range(length):
         current_node = nodes[i]
-        neighbors_sum = sum(graph.edge_weight((current_node, neighbor)) for neighbor in graph.neighbors(current_node))
-        for j in range(length):
-            edge_weight = float(graph.edge_weight((current_node, nodes[j])))
+        neighbors = graph.neighbors(current_node)
+        neighbors_sum = sum(graph.edge_weight((current_node, neighbor)) for neighbor in neighbors)
+        for neighbor in neighbors:
+            j = node_index[neighbor]
+            edge_weight = float(graph.edge_weight((current_node, neighbor)))
             if i != j and edge_weight != 0:
                 row.append(i)
                 col.append(j)
@@ -60,6 +120,20 @@ def build_adjacency_matrix(graph):
     return csr_matrix((data, (row, col)), shape=(length, length))
 
 
+def _build_adjacency_matrix_from_arrays(graph):
+    """Нормирует строки матрицы весов ArrayGraph без обхода рёбер в Python."""
+    weights = graph.to_csr_matrix()
+    neighbors_sums = numpy.asarray(weights.sum(axis=1)).ravel()
+    inverse_sums = numpy.zeros_like(neighbors_sums)
+    numpy.divide(1.0, neighbors_sums, out=inverse_sums, where=neighbors_sums != 0)
+
+    normalized = (diags(inverse_sums) @ weights).tocoo()
+    # Как и в общем случае, петли и нулевые веса в матрицу не попадают.
+    mask = (normalized.row != normalized.col) & (normalized.data != 0)
+    return csr_matrix((normalized.data[mask], (normalized.row[mask], normalized.col[mask])),
+                      shape=normalized.shape)
+
+
 def build_probability_matrix(graph):
     dimension = len(graph.nodes())
     matrix = empty_matrix((dimension, dimension))
@@ -76,3 +150,16 @@ def process_results(graph, vecs):
         scores[node] = abs(vecs[i][0])
 
     return scores
+
+
+PAGERANK_ENGINES = {
+    "python": pagerank_weighted,
+    "scipy": pagerank_weighted_scipy,
+    "sparse": pagerank_weighted_sparse,
+}
+
+
+def get_pagerank_engine(name):
+    if name not in PAGERANK_ENGINES:
+        raise ValueError("Valid engines are: " + ", ".join(sorted(PAGERANK_ENGINES)))
+    return PAGERANK_ENGINES[name]
@@ -0,0 +1,203 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter
+
+from .Keywords import keywords as _keywords
+from .Summarizer import summarize as _summarize
+from .Utils.TextCleaner import get_text_cleaner as _get_text_cleaner
+
+# Целевой объём текста в одной порции, отправляемой процессу.
+# Короткие документы группируются, длинные отправляются по одному.
+CHUNK_CHARACTERS = 200000
+CHUNK_MAX_DOCUMENTS = 256
+
+# Сколько порций приходится на процесс, чтобы нагрузка выравнивалась
+# при разной длине документов.
+CHUNKS_PER_PROCESS = 4
+
+# Сколько порций на процесс может находиться в работе одновременно.
+PENDING_CHUNKS_PER_PROCESS = 2
+
+# Параметры summarize, которые можно передать в пул.
+SUMMARIZE_PARAMETERS = ("ratio", "words", "split", "scores", "engine", "knapsack")
+KEYWORDS_PARAMETERS = ("ratio", "words", "split", "scores", "window", "engine", "deacc")
+
+WARM_UP_TEXT = "Graph ranking warms up the workers. " \
+               "Graph ranking loads stopwords and the stemmer. " \
+               "Workers rank the graph before the first document."
+
+
+def _init_worker(language, additional_stopwords):
+    # Стоп-слова, стеммер и пути scipy загружаются до первого документа.
+    cleaner = _get_text_cleaner(language, additional_stopwords)
+    _summarize(WARM_UP_TEXT, language, cleaner=cleaner)
+
+
+def _summarize_chunk(chunk, language, additional_stopwords, parameters):
+    """ Выполняется в процессе пула. Возвращает записи (номер, результат, ошибка, время). """
+    cleaner = _get_text_cleaner(language, additional_stopwords)
+    records = []
+    for index, text in chunk:
+        start = perf_counter()
+        try:
+            result, error = _summarize(text, language, cleaner=cleaner, **parameters), None
+        except Exception as exception:
+            result, error = None, exception
+        records.append((index, result, error, perf_counter() - start))
+    return records
+
+
+def _iter_chunks(texts, chunk_characters):
+    chunk = []
+    characters = 0
+    for index, text in enumerate(texts):
+        chunk.append((index, text))
+        # Ошибку неверного типа вернёт summarize в процессе пула.
+        characters += len(text) if isinstance(text, str) else 0
+        if characters >= chunk_characters or len(chunk) >= CHUNK_MAX_DOCUMENTS:
+            yield chunk
+            chunk = []
+            characters = 0
+    if chunk:
+        yield chunk
+
+
+class SummaryPool(object):
+    """
+    Пул процессов с заранее загруженными стоп-словами, стеммером и scipy.
+    Документы группируются в порции по суммарной длине, число порций
+    в работе ограничено, поэтому входные данные могут быть потоком.
+    """
+
+    def __init__(self, language, additional_stopwords=None, processes=None):
+        self.language = language
+        self.additional_stopwords = additional_stopwords
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = self.processes * PENDING_CHUNKS_PER_PROCESS
+        self._executor = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                             initargs=(language, additional_stopwords))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    @property
+    def broken(self):
+        """ True, если процесс пула аварийно завершился и пул больше не принимает задачи. """
+        return bool(getattr(self._executor, "_broken", False))
+
+    def submit(self, text, language=None, additional_stopwords=None, **parameters):
+        """ Отправляет один документ; возвращает concurrent.futures.Future с результатом summarize.
+         По умолчанию используются язык и стоп-слова пула. """
+        _check_parameters(parameters)
+        if language is None:
+            language, additional_stopwords = self.language, self.additional_stopwords
+        return self._executor.submit(_summarize, text, language, additional_stopwords=additional_stopwords,
+                                     **parameters)
+
+    def submit_keywords(self, text, language=None, additional_stopwords=None, **parameters):
+        """ Отправляет один документ; возвращает concurrent.futures.Future с результатом keywords. """
+        _check_parameters(parameters, KEYWORDS_PARAMETERS)
+        if language is None:
+            language, additional_stopwords = self.language, self.additional_stopwords
+        return self._executor.submit(_keywords, text, language, additional_stopwords=additional_stopwords,
+                                     **parameters)
+
+    def imap(self, texts, ordered=True, timings=False, return_exceptions=False, chunk_characters=None,
+             **parameters):
+        """
+        Выдаёт пары (номер документа, результат) в порядке входа или, при
+        ordered=False, по мере готовности. При timings=True к паре добавляется
+        время обработки документа в секундах. При return_exceptions=True
+        ошибка документа возвращается вместо результата, иначе выбрасывается.
+        """
+        _check_parameters(parameters)
+        if chunk_characters is None:
+            chunk_characters = self._chunk_characters(texts)
+        chunks = _iter_chunks(texts, chunk_characters)
+
+        pending = {}    # Future -> номер порции
+        completed = {}  # Номер порции -> записи, ожидающие выдачи по порядку
+        next_chunk = 0
+        submitted = 0
+        try:
+            while True:
+                # Ожидающие выдачи порции тоже занимают память, поэтому учитываются в лимите.
+                while len(pending) + len(completed) < self.max_pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    future = self._executor.submit(_summarize_chunk, chunk, self.language,
+                                                   self.additional_stopwords, parameters)
+                    pending[future] = submitted
+                    submitted += 1
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number = pending.pop(future)
+                    if ordered:
+                        completed[number] = future.result()
+                    else:
+                        yield from _format_records(future.result(), timings, return_exceptions)
+
+                while next_chunk in completed:
+                    yield from _format_records(completed.pop(next_chunk), timings, return_exceptions)
+                    next_chunk += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def map(self, texts, **parameters):
+        """ Возвращает список результатов в порядке входа. """
+        return [result for _, result in self.imap(texts, ordered=True, **parameters)]
+
+    def _chunk_characters(self, texts):
+        # Для списков размер порции подбирается так, чтобы на каждый процесс
+        # пришлось несколько порций; длина потока заранее неизвестна.
+        if not hasattr(texts, "__len__"):
+            return CHUNK_CHARACTERS
+        # Ошибку неверного типа вернёт summarize в процессе пула, как и в _iter_chunks.
+        total = sum(len(text) for text in texts if isinstance(text, str))
+        return max(1, min(CHUNK_CHARACTERS, total // (self.processes * CHUNKS_PER_PROCESS)))
+
+
+def _check_parameters(parameters, supported=SUMMARIZE_PARAMETERS):
+    unknown = set(parameters) - set(supported)
+    if unknown:
+        raise ValueError("Unsupported parameters: " + ", ".join(sorted(unknown)))
+
+
+def _format_records(records, timings, return_exceptions):
+    for index, result, error, elapsed in records:
+        if error is not None:
+            if not return_exceptions:
+                raise error
+            result = error
+        yield (index, result, elapsed) if timings else (index, result)
+
+
+def summarize_many(texts, language, ratio=0.2, words=None, split=False, scores=False, engine="sparse",
+                   additional_stopwords=None, knapsack=False, processes=None, ordered=True):
+    """
+    Резюмирует набор текстов на всех ядрах машины.
+    При ordered=True возвращает список результатов в порядке texts,
+    иначе - итератор пар (номер текста, результат) по мере готовности.
+    """
+    parameters = dict(ratio=ratio, words=words, split=split, scores=scores, engine=engine, knapsack=knapsack)
+    if ordered:
+        with SummaryPool(language, additional_stopwords, processes) as pool:
+            return pool.map(texts, **parameters)
+    return _summarize_unordered(texts, language, additional_stopwords, processes, parameters)
+
+
+def _summarize_unordered(texts, language, additional_stopwords, processes, parameters):
+    with SummaryPool(language, additional_stopwords, processes) as pool:
+        yield from pool.imap(texts, ordered=False, **parameters)
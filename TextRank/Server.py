@@ -0,0 +1,298 @@
+"""
+HTTP-сервис резюмирования на стандартной библиотеке.
+
+    python -m TextRank.Server --language russian --port 8080 --processes 4
+
+POST /summarize  {"text": "...", "language": "...", "ratio": 0.2, "words": null, ...}
+POST /keywords   {"text": "...", "language": "...", "ratio": 0.2, "window": 2, ...}
+GET  /health     состояние сервиса
+GET  /metrics    счётчики и задержки в текстовом формате Prometheus
+
+Документы обрабатываются пулом заранее прогретых процессов. Запросы сверх
+--queue-size отклоняются с кодом 503, тела больше --max-bytes - с кодом 413.
+"""
+
+import argparse
+import json
+import sys
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+
+from .Parallel import KEYWORDS_PARAMETERS, SUMMARIZE_PARAMETERS, SummaryPool
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_MAX_BYTES = 1 << 20
+DEFAULT_TIMEOUT = 30.0
+
+# Границы корзин гистограммы задержек, в секундах.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceMetrics(object):
+    """Счётчики запросов и гистограмма задержек, общие для всех потоков сервера."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.requests = {}  # (путь, код ответа) -> число запросов
+        self.in_flight = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_count = 0
+        self.latency_sum = 0.0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, path, status, elapsed):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[path, status] = self.requests.get((path, status), 0) + 1
+            self.latency_count += 1
+            self.latency_sum += elapsed
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    self.latency_buckets[i] += 1
+
+    def render(self):
+        with self._lock:
+            lines = ["# TYPE textrank_requests_total counter"]
+            for (path, status), count in sorted(self.requests.items()):
+                lines.append('textrank_requests_total{path="%s",status="%d"} %d' % (path, status, count))
+            lines.append("# TYPE textrank_requests_in_flight gauge")
+            lines.append("textrank_requests_in_flight %d" % self.in_flight)
+            lines.append("# TYPE textrank_request_seconds histogram")
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets):
+                lines.append('textrank_request_seconds_bucket{le="%g"} %d' % (bound, count))
+            lines.append('textrank_request_seconds_bucket{le="+Inf"} %d' % self.latency_count)
+            lines.append("textrank_request_seconds_sum %f" % self.latency_sum)
+            lines.append("textrank_request_seconds_count %d" % self.latency_count)
+            return "\n".join(lines) + "\n"
+
+
+class SummaryService(object):
+    """Пул процессов, очередь запросов ограниченной длины и метрики."""
+
+    def __init__(self, language, processes=None, queue_size=DEFAULT_QUEUE_SIZE, max_bytes=DEFAULT_MAX_BYTES,
+                 timeout=DEFAULT_TIMEOUT):
+        self.language = language
+        self.processes = processes
+        self.queue_size = queue_size
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.pool = SummaryPool(language, processes=processes)
+        self.pool_restarts = 0
+        self.metrics = ServiceMetrics()
+        self._slots = BoundedSemaphore(queue_size)
+        self._queued = 0
+        self._queued_lock = Lock()
+        self._pool_lock = Lock()
+
+    def summarize(self, request):
+        return {"summary": self._run("submit", SUMMARIZE_PARAMETERS, request)}
+
+    def keywords(self, request):
+        return {"keywords": self._run("submit_keywords", KEYWORDS_PARAMETERS, request)}
+
+    def _get_pool(self):
+        """ Возвращает пул, пересоздавая его, если процесс пула аварийно завершился. """
+        with self._pool_lock:
+            broken = None
+            if self.pool.broken:
+                broken, self.pool = self.pool, SummaryPool(self.language, processes=self.processes)
+                self.pool_restarts += 1
+            pool = self.pool
+        if broken is not None:
+            broken.close()
+        return pool
+
+    def _release(self, future):
+        with self._queued_lock:
+            self._queued -= 1
+        self._slots.release()
+
+    def _run(self, submit, supported_parameters, request):
+        text = request.get("text")
+        if not isinstance(text, str):
+            raise RequestError(400, "'text' must be a string")
+
+        parameters = {name: request[name] for name in supported_parameters if name in request}
+        language = request.get("language", self.language)
+        additional_stopwords = request.get("additional_stopwords")
+
+        # Запросы, не поместившиеся в очередь, отклоняются сразу, а не ждут.
+        # Место в очереди занято, пока процесс не закончит документ, даже если
+        # клиент уже получил 504: иначе брошенные задачи копились бы в пуле.
+        if not self._slots.acquire(blocking=False):
+            raise RequestError(503, "queue is full")
+        with self._queued_lock:
+            self._queued += 1
+        try:
+            future = getattr(self._get_pool(), submit)(text, language, additional_stopwords, **parameters)
+        except BrokenProcessPool:
+            self._release(None)
+            raise RequestError(503, "worker pool is restarting")
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            # Снимает задачу с очереди, если она ещё не начата.
+            future.cancel()
+            raise RequestError(504, "request timed out")
+        except BrokenProcessPool:
+            raise RequestError(503, "worker pool is restarting")
+        except ValueError as error:
+            raise RequestError(400, str(error))
+
+    def health(self):
+        with self._queued_lock:
+            queued = self._queued
+        # Пул пересоздаётся при следующем запросе; до этого сервис сообщает о сбое.
+        return {"status": "broken" if self.pool.broken else "ok", "language": self.language,
+                "processes": self.pool.processes, "queued": queued, "queue_size": self.queue_size,
+                "pool_restarts": self.pool_restarts}
+
+    def close(self):
+        self.pool.close()
+
+
+class SummaryRequestHandler(BaseHTTPRequestHandler):
+    server_version = "TextRank"
+    protocol_version = "HTTP/1.1"
+
+    # Обработчики POST-запросов: путь -> метод SummaryService.
+    POST_ROUTES = {
+        "/summarize": "summarize",
+        "/keywords": "keywords",
+    }
+    GET_PATHS = ("/health", "/metrics")
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        start = perf_counter()
+        self.service.metrics.started()
+        status = 200
+        if self.path == "/health":
+            self._send_json(status, self.service.health())
+        elif self.path == "/metrics":
+            self._send(status, self.service.metrics.render().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            status = 404
+            self._send_json(status, {"error": "not found"})
+        self.service.metrics.finished(self._metrics_path(), status, perf_counter() - start)
+
+    def do_POST(self):
+        start = perf_counter()
+        self.service.metrics.started()
+        status = 200
+        try:
+            if self.path not in self.POST_ROUTES:
+                raise RequestError(404, "not found")
+            response = getattr(self.service, self.POST_ROUTES[self.path])(self._read_json())
+            response["seconds"] = perf_counter() - start
+            self._send_json(status, response)
+        except RequestError as error:
+            status = error.status
+            self._send_json(status, {"error": str(error)})
+        except Exception as error:
+            status = 500
+            self._send_json(status, {"error": "%s: %s" % (type(error).__name__, error)})
+        self.service.metrics.finished(self._metrics_path(), status, perf_counter() - start)
+
+    def _metrics_path(self):
+        # Неизвестные пути собираются под одной меткой: иначе клиент мог бы
+        # создать сколько угодно рядов метрик или сломать синтаксис меток.
+        if self.path in self.POST_ROUTES or self.path in self.GET_PATHS:
+            return self.path
+        return "other"
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Тело неизвестной длины не читается, поэтому соединение закрывается.
+            self.close_connection = True
+            raise RequestError(400, "Content-Length must be a non-negative integer")
+        if length > self.service.max_bytes:
+            # Тело не читается, поэтому соединение закрывается.
+            self.close_connection = True
+            raise RequestError(413, "request body exceeds %d bytes" % self.service.max_bytes)
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            raise RequestError(400, "request body must be a JSON object")
+        if not isinstance(request, dict):
+            raise RequestError(400, "request body must be a JSON object")
+        return request
+
+    def _send_json(self, status, body):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(service, host="127.0.0.1", port=8080, verbose=False):
+    server = ThreadingHTTPServer((host, port), SummaryRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TextRank summarization HTTP service")
+    parser.add_argument("--language", required=True, help="default language, workers are warmed up for it")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="requests accepted at once; the rest get 503")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="largest accepted request body")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    service = SummaryService(args.language, args.processes, args.queue_size, args.max_bytes, args.timeout)
+    server = create_server(service, args.host, args.port, args.verbose)
+    print("Serving on http://%s:%d" % server.server_address[:2], file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
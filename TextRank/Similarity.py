@@ -0,0 +1,243 @@
+from array import array
+from math import log10
+
+import numpy
+from scipy.sparse import csr_matrix, triu
+
+# Сколько строк матрицы сходства считается за раз при прореживании.
+SIMILARITY_BLOCK_SIZE = 512
+
+# Сколько строк используется для оценки квантиля весов.
+QUANTILE_SAMPLE_SIZE = 2000
+
+# Сколько весов в среднем на строку выборки сохраняется для оценки квантиля.
+QUANTILE_PAIRS_PER_ROW = 200
+
+
+def _split_tokens(tokens):
+    return [token.split() if isinstance(token, str) else token for token in tokens]
+
+
+def build_incidence_matrix(tokens):
+    """
+    Строит разреженную матрицу вхождений предложение × термин.
+    Элемент (i, k) равен 1, если слово k встречается в предложении i.
+    @type  tokens: list
+    @param tokens: Список обработанных предложений (слова через пробел или списки слов).
+    @rtype:  csr_matrix
+    @return: Бинарная матрица размера (число предложений, размер словаря).
+    """
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    for words in _split_tokens(tokens):
+        for word in set(words):
+            indices.append(vocabulary.setdefault(word, len(vocabulary)))
+        indptr.append(len(indices))
+
+    data = numpy.ones(len(indices), dtype=numpy.float64)
+    return csr_matrix((data, indices, indptr), shape=(len(tokens), len(vocabulary)))
+
+
+def build_incidence_matrix_from_ids(ids, vocabulary_size=None):
+    """
+    Строит матрицу вхождений по массивам идентификаторов основ (см. Vocabulary).
+    @type  ids: list
+    @param ids: Список массивов идентификаторов, по одному на предложение.
+    @type  vocabulary_size: int
+    @param vocabulary_size: Размер словаря; по умолчанию наибольший идентификатор + 1.
+    @rtype:  csr_matrix
+    @return: Бинарная матрица размера (число предложений, размер словаря).
+    """
+    flat_ids = array('I')
+    for sentence_ids in ids:
+        flat_ids.extend(sentence_ids)
+
+    cols = numpy.frombuffer(flat_ids, dtype=numpy.uint32).astype(numpy.int32) if flat_ids else \
+        numpy.zeros(0, dtype=numpy.int32)
+    rows = numpy.repeat(numpy.arange(len(ids), dtype=numpy.int32), [len(sentence_ids) for sentence_ids in ids])
+    if vocabulary_size is None:
+        vocabulary_size = int(cols.max()) + 1 if len(cols) else 0
+
+    # Повторы слова в предложении суммируются, после чего матрица снова делается бинарной.
+    incidence = csr_matrix((numpy.ones(len(cols)), (rows, cols)), shape=(len(ids), vocabulary_size))
+    incidence.data[:] = 1
+    return incidence
+
+
+def build_similarity_matrix(tokens):
+    """
+    Рассчитывает коэффициенты подобия для всех пар предложений одним
+    разреженным матричным произведением.
+    Вес пары - число общих слов, делённое на сумму log10 длин предложений,
+    как в исходном попарном алгоритме TextRank.
+    @type  tokens: list
+    @param tokens: Список обработанных предложений (слова через пробел или списки слов).
+    @rtype:  csr_matrix
+    @return: Симметричная матрица весов с нулевой диагональю и без явных нулей.
+    """
+    tokens = _split_tokens(tokens)
+    incidence = build_incidence_matrix(tokens)
+    return _similarity_from_incidence(incidence, [len(words) for words in tokens])
+
+
+def build_similarity_matrix_from_ids(ids, vocabulary_size=None):
+    """
+    То же, что build_similarity_matrix, но по массивам идентификаторов основ.
+    Слова сравниваются как целые числа, строки не хешируются.
+    """
+    incidence = build_incidence_matrix_from_ids(ids, vocabulary_size)
+    return _similarity_from_incidence(incidence, [len(sentence_ids) for sentence_ids in ids])
+
+
+def _similarity_from_incidence(incidence, lengths):
+    length = len(lengths)
+
+    # Число общих слов для каждой пары, только над главной диагональю.
+    common = triu(incidence.dot(incidence.T), k=1, format="coo")
+
+    log_lengths = numpy.array([log10(words_count) for words_count in lengths], dtype=numpy.float64)
+    norm = log_lengths[common.row] + log_lengths[common.col]
+
+    # Пары из двух однословных предложений имеют нулевой вес.
+    weights = numpy.zeros_like(common.data)
+    numpy.divide(common.data, norm, out=weights, where=norm != 0)
+
+    upper = csr_matrix((weights, (common.row, common.col)), shape=(length, length))
+    upper.eliminate_zeros()
+    similarity = (upper + upper.T).tocsr()
+    similarity.sort_indices()
+    return similarity
+
+
+class SimilaritySparsifier(object):
+    """
+    Прореживает граф сходства предложений во время построения.
+    Матрица сходства считается блоками строк, и в каждом блоке сразу
+    отбрасываются лишние рёбра, поэтому полная матрица в памяти не строится.
+    top_k - у каждого предложения остаются k самых тяжёлых рёбер
+    (ребро сохраняется, если входит в k лучших хотя бы у одного из концов);
+    threshold - остаются рёбра с весом не меньше порога;
+    quantile - порог берётся как квантиль весов рёбер, оценённый по выборке
+    из QUANTILE_SAMPLE_SIZE строк, в каждой из которых сохраняется около
+    QUANTILE_PAIRS_PER_ROW весов (для небольших графов - точно).
+    """
+
+    def __init__(self, top_k=None, threshold=None, quantile=None, block_size=SIMILARITY_BLOCK_SIZE):
+        if top_k is None and threshold is None and quantile is None:
+            raise ValueError("At least one of top_k, threshold and quantile must be set")
+        if threshold is not None and quantile is not None:
+            raise ValueError("threshold and quantile can not be used together")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be positive")
+        if quantile is not None and not 0 <= quantile < 1:
+            raise ValueError("quantile must be in [0, 1)")
+        self.top_k = top_k
+        self.threshold = threshold
+        self.quantile = quantile
+        self.block_size = block_size
+
+    def build_similarity_matrix(self, ids, vocabulary_size=None):
+        """
+        То же, что build_similarity_matrix_from_ids, но только с оставленными рёбрами.
+        @rtype:  csr_matrix
+        @return: Симметричная матрица весов с нулевой диагональю и без явных нулей.
+        """
+        incidence = build_incidence_matrix_from_ids(ids, vocabulary_size)
+        log_lengths = _get_log_lengths([len(sentence_ids) for sentence_ids in ids])
+        length = len(ids)
+
+        threshold = self.threshold
+        if self.quantile is not None:
+            threshold = self._sample_quantile(incidence, log_lengths, length)
+
+        parts = [self._select(*_rows_weights(incidence, log_lengths, numpy.arange(start, min(start + self.block_size,
+                                                                                              length))), threshold)
+                 for start in range(0, length, self.block_size)]
+        return self._assemble(parts, length)
+
+    def _sample_quantile(self, incidence, log_lengths, length):
+        """ Оценивает квантиль весов по выборке строк, считая их блоками по block_size. """
+        sample = numpy.unique(numpy.linspace(0, length - 1, min(length, QUANTILE_SAMPLE_SIZE)).astype(int))
+        weights = []
+        for start in range(0, len(sample), self.block_size):
+            block = sample[start:start + self.block_size]
+            block_weights = _rows_weights(incidence, log_lengths, block)[2]
+            # Из длинных строк берётся каждый step-й вес, чтобы выборка не росла с размером графа.
+            step = max(1, len(block_weights) // (QUANTILE_PAIRS_PER_ROW * len(block)))
+            weights.append(block_weights[::step].copy())
+        return _weight_quantile(numpy.concatenate(weights), self.quantile) if weights else None
+
+    def prune(self, matrix):
+        """ Прореживает уже построенную симметричную матрицу весов. """
+        matrix = matrix.tocsr().sorted_indices().tocoo()
+        threshold = self.threshold
+        if self.quantile is not None:
+            threshold = _weight_quantile(matrix.data, self.quantile)
+        return self._assemble([self._select(matrix.row, matrix.col, matrix.data, threshold)], matrix.shape[0])
+
+    def _select(self, rows, cols, weights, threshold):
+        if threshold is not None:
+            mask = weights >= threshold
+            rows, cols, weights = rows[mask], cols[mask], weights[mask]
+
+        if self.top_k is not None and len(rows):
+            # Рёбра сгруппированы по строкам и упорядочены по столбцу внутри строки.
+            group_starts = numpy.flatnonzero(numpy.r_[True, rows[1:] != rows[:-1]])
+            group_ends = numpy.r_[group_starts[1:], len(rows)]
+            keep = numpy.repeat(group_ends - group_starts <= self.top_k, group_ends - group_starts)
+            for start, end in zip(group_starts, group_ends):
+                if end - start > self.top_k:
+                    keep[start:end] = _top_k_mask(weights[start:end], self.top_k)
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+        return rows, cols, weights
+
+    def _assemble(self, parts, length):
+        rows = numpy.concatenate([part[0] for part in parts]) if parts else numpy.zeros(0, dtype=numpy.int32)
+        cols = numpy.concatenate([part[1] for part in parts]) if parts else numpy.zeros(0, dtype=numpy.int32)
+        weights = numpy.concatenate([part[2] for part in parts]) if parts else numpy.zeros(0)
+
+        similarity = csr_matrix((weights, (rows, cols)), shape=(length, length))
+        if self.top_k is not None:
+            # Выбор k лучших несимметричен: ребро остаётся, если его выбрал любой из концов.
+            similarity = similarity.maximum(similarity.T).tocsr()
+        similarity.eliminate_zeros()
+        similarity.sort_indices()
+        return similarity
+
+
+def _get_log_lengths(lengths):
+    return numpy.array([log10(words_count) if words_count else 0.0 for words_count in lengths],
+                       dtype=numpy.float64)
+
+
+def _rows_weights(incidence, log_lengths, row_indices):
+    """ Веса рёбер строк row_indices полной матрицы сходства: (строки, столбцы, веса) без нулей и диагонали. """
+    # Столбцы упорядочены, чтобы при равных весах выбор top_k не зависел от порядка произведения.
+    common = incidence[row_indices].dot(incidence.T)
+    common.sort_indices()
+    common = common.tocoo()
+    rows = row_indices[common.row]
+    mask = rows != common.col
+    rows, cols, counts = rows[mask], common.col[mask], common.data[mask]
+
+    norm = log_lengths[rows] + log_lengths[cols]
+    weights = numpy.zeros_like(counts)
+    numpy.divide(counts, norm, out=weights, where=norm != 0)
+    mask = weights != 0
+    return rows[mask], cols[mask], weights[mask]
+
+
+def _top_k_mask(weights, k):
+    """ Маска k наибольших весов; из равных k-му весу берутся первые по порядку. """
+    kth = numpy.partition(weights, len(weights) - k)[len(weights) - k]
+    mask = weights > kth
+    ties = numpy.flatnonzero(weights == kth)
+    mask[ties[:k - numpy.count_nonzero(mask)]] = True
+    return mask
+
+
+def _weight_quantile(weights, quantile):
+    weights = weights[weights != 0]
+    return float(numpy.quantile(weights, quantile)) if len(weights) else None
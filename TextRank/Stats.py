@@ -0,0 +1,59 @@
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+_NO_STAGE = nullcontext()
+
+
+class SummaryStats(object):
+    """
+    Время этапов и счётчики одного вызова summarize.
+    Передаётся в summarize(stats=...) и заполняется по ходу работы;
+    без него замеры не выполняются.
+    """
+
+    def __init__(self):
+        self.timings = {}  # Этап -> время в секундах
+        self.sentences = 0
+        self.nodes = 0
+        self.edges = 0
+        self.vocabulary_size = 0
+        self.stem_cache_hits = 0
+        self.stem_cache_misses = 0
+        self.pagerank_iterations = None
+        self.pagerank_residual = None
+
+    @contextmanager
+    def stage(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + perf_counter() - start
+
+    @property
+    def total_time(self):
+        return sum(self.timings.values())
+
+    def as_dict(self):
+        return {
+            "timings": dict(self.timings),
+            "total_time": self.total_time,
+            "sentences": self.sentences,
+            "nodes": self.nodes,
+            "edges": self.edges,
+            "vocabulary_size": self.vocabulary_size,
+            "stem_cache_hits": self.stem_cache_hits,
+            "stem_cache_misses": self.stem_cache_misses,
+            "pagerank_iterations": self.pagerank_iterations,
+            "pagerank_residual": self.pagerank_residual,
+        }
+
+    def __repr__(self):
+        return "SummaryStats(%r)" % self.as_dict()
+
+
+def measure(stats, name):
+    """Замеряет этап name, если stats задан, иначе ничего не делает."""
+    if stats is None:
+        return _NO_STAGE
+    return stats.stage(name)
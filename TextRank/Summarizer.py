@@ -1,30 +1,72 @@
-from math import log10
+import heapq
 
-from .PageRankWeighted import pagerank_weighted_scipy as _pagerank
+import numpy
+from scipy.sparse import csr_matrix
+
+from .PageRankWeighted import get_pagerank_engine as _get_pagerank_engine
 from .Utils.TextCleaner import clean_text_by_sentences as _clean_text_by_sentences
+from .Utils.TextCleaner import get_text_cleaner as _get_text_cleaner
 from .Commons import build_graph as _build_graph
 from .Commons import remove_unreachable_nodes as _remove_unreachable_nodes
+from .Graph import ArrayGraph as _ArrayGraph
+from .Stats import measure as _measure
+from .Similarity import build_similarity_matrix as _build_similarity_matrix
+from .Similarity import build_similarity_matrix_from_ids as _build_similarity_matrix_from_ids
 
 
-def _set_graph_edge_weights(graph):
-    for sentence_1 in graph.nodes():
-        for sentence_2 in graph.nodes():
+def _set_graph_edge_weights(graph, sentences=None, lsh=None, sparsify=None):
+    nodes = graph.nodes()
+    if sentences is None:
+        similarity_matrix = _build_similarity_matrix(nodes)
+    elif sentences and sentences[0].ids is not None:
+        # Слова сравниваются по целочисленным идентификаторам словаря.
+        # Узел - позиция первого предложения с такими основами (см. _get_sentence_nodes).
+        ids = [sentences[node].ids for node in nodes]
+        if lsh is not None:
+            # Веса считаются только для пар-кандидатов MinHash/LSH.
+            similarity_matrix = lsh.build_similarity_matrix(ids, len(sentences[0].vocabulary))
+        elif sparsify is not None:
+            # Лишние рёбра отбрасываются по блокам строк, полная матрица не строится.
+            similarity_matrix = sparsify.build_similarity_matrix(ids, len(sentences[0].vocabulary))
+        else:
+            similarity_matrix = _build_similarity_matrix_from_ids(ids, len(sentences[0].vocabulary))
+    else:
+        # Готовые списки основ не нужно заново разбивать по пробелам.
+        similarity_matrix = _build_similarity_matrix([sentences[node].tokens for node in nodes])
 
-            edge = (sentence_1, sentence_2)
-            if sentence_1 != sentence_2 and not graph.has_edge(edge):
-                similarity = _get_similarity(sentence_1, sentence_2)
-                if similarity != 0:
-                    graph.add_edge(edge, similarity)
+    if sparsify is not None and (lsh is not None or sentences is None or sentences[0].ids is None):
+        similarity_matrix = sparsify.prune(similarity_matrix)
+
+    if isinstance(graph, _ArrayGraph):
+        graph.set_adjacency_matrix(similarity_matrix)
+    else:
+        # Рёбра добавляются в том же порядке, что и при полном переборе пар узлов.
+        indptr = similarity_matrix.indptr
+        indices = similarity_matrix.indices.tolist()
+        data = similarity_matrix.data.tolist()
+        for i in range(len(nodes)):
+            for position in range(indptr[i], indptr[i + 1]):
+                j = indices[position]
+                if i < j:
+                    graph.add_edge((nodes[i], nodes[j]), data[position])
 
     # Обрабатывает случай, когда все сходства равны нулю.
     # Итоговое резюме будет состоять из случайных предложений.
-    if all(graph.edge_weight(edge) == 0 for edge in graph.edges()):
+    if similarity_matrix.nnz == 0:
         _create_valid_graph(graph)
 
 
 def _create_valid_graph(graph):
     nodes = graph.nodes()
 
+    if isinstance(graph, _ArrayGraph):
+        # Полный граф с единичными весами задаётся одной матрицей,
+        # без поштучного удаления и добавления рёбер.
+        complete = numpy.ones((len(nodes), len(nodes)))
+        numpy.fill_diagonal(complete, 0)
+        graph.set_adjacency_matrix(csr_matrix(complete))
+        return
+
     for i in range(len(nodes)):
         for j in range(len(nodes)):
             if i == j:
@@ -38,25 +80,6 @@ def _create_valid_graph(graph):
             graph.add_edge(edge, 1)
 
 
-def _get_similarity(s1, s2):
-    words_sentence_one = s1.split()
-    words_sentence_two = s2.split()
-
-    common_word_count = _count_common_words(words_sentence_one, words_sentence_two)
-
-    log_s1 = log10(len(words_sentence_one))
-    log_s2 = log10(len(words_sentence_two))
-
-    if log_s1 + log_s2 == 0:
-        return 0
-
-    return common_word_count / (log_s1 + log_s2)
-
-
-def _count_common_words(words_sentence_one, words_sentence_two):
-    return len(set(words_sentence_one) & set(words_sentence_two))
-
-
 def _format_results(extracted_sentences, split, score):
     if score:
         return [(sentence.text, sentence.score) for sentence in extracted_sentences]
@@ -65,24 +88,33 @@ def _format_results(extracted_sentences, split, score):
     return "\n".join([sentence.text for sentence in extracted_sentences])
 
 
+def _get_sentence_nodes(sentences):
+    """ Узел графа для каждого предложения - позиция первого предложения с теми
+     же основами, поэтому одинаковые предложения делят узел, а ключи графа -
+     целые числа, а не строки основ. """
+    first_positions = {}
+    if sentences and sentences[0].ids is not None:
+        return [first_positions.setdefault(sentence.ids.tobytes(), position)
+                for position, sentence in enumerate(sentences)]
+    return [first_positions.setdefault(sentence.token, position) for position, sentence in enumerate(sentences)]
+
+
 def _add_scores_to_sentences(sentences, scores):
-    for sentence in sentences:
+    for sentence, node in zip(sentences, _get_sentence_nodes(sentences)):
         # Добавляет счет к объекту, если он есть.
-        if sentence.token in scores:
-            sentence.score = scores[sentence.token]
-        else:
-            sentence.score = 0
+        sentence.score = scores.get(node, 0)
 
 
-def _get_sentences_with_word_count(sentences, words):
+def _get_sentences_with_word_count(ranking, words):
     """ Учитывает список предложений, возвращает список предложений с
      общим количеством слов, аналогично предоставленному количеству слов.
     """
     word_count = 0
     selected_sentences = []
     # Цикл, пока не будет достигнуто количество слов.
-    for sentence in sentences:
-        words_in_sentence = len(sentence.text.split())
+    # Предложения уже упорядочены по убыванию оценки.
+    for sentence in ranking:
+        words_in_sentence = sentence.word_count
 
         # Проверяет, дает ли включение предложения лучшее приближение
         # к параметру слова.
@@ -95,51 +127,214 @@ def _get_sentences_with_word_count(sentences, words):
     return selected_sentences
 
 
-def _extract_most_important_sentences(sentences, ratio, words):
-    sentences.sort(key=lambda s: s.score, reverse=True)
+def _get_sentences_with_word_count_knapsack(sentences, words):
+    """ Выбирает предложения с наибольшей суммой оценок, в которых всего
+     не больше words слов (задача о рюкзаке 0/1, динамическое программирование
+     по числу слов за O(n * words)).
+    """
+    # Как и в жадном отборе, при неположительном words ничего не выбирается.
+    if words <= 0:
+        return []
+
+    candidates = [sentence for sentence in sentences if sentence.word_count <= words]
+
+    # best[c] - наибольшая сумма оценок при не более чем c словах.
+    best = numpy.zeros(words + 1)
+    taken = []
+    for sentence in candidates:
+        count = sentence.word_count
+        candidate = best[:words + 1 - count] + sentence.score
+        improved = candidate > best[count:]
+        best[count:][improved] = candidate[improved]
+        taken.append(numpy.packbits(improved))
+
+    # Восстанавливает выбранные предложения с конца.
+    selected_sentences = []
+    capacity = words
+    for i in range(len(candidates) - 1, -1, -1):
+        position = capacity - candidates[i].word_count
+        if position >= 0 and (taken[i][position >> 3] >> (7 - (position & 7))) & 1:
+            selected_sentences.append(candidates[i])
+            capacity = position
+
+    selected_sentences.reverse()
+    return selected_sentences
 
-    # Если не выбрана опция «слова», количество предложений
-    # уменьшается на установленное соотношение.
-    if words is None:
-        length = len(sentences) * ratio
-        return sentences[:int(length)]
 
-    # Иначе, соотношение игнорируется.
-    else:
-        return _get_sentences_with_word_count(sentences, words)
+def _get_stem_cache_info(cleaner):
+    cache_info = getattr(cleaner.stemmer, "cache_info", None)
+    return cache_info() if cache_info is not None else None
+
+
+def _collect_stats(stats, cleaner, stem_cache_info, sentences, graph):
+    stats.sentences = len(sentences)
+    stats.nodes = len(graph.nodes())
+    stats.edges = graph.to_csr_matrix().nnz // 2
+    stats.vocabulary_size = len(sentences[0].vocabulary) if sentences else 0
+
+    # Кэш основ общий для процесса, поэтому считается прирост за время вызова.
+    current_info = _get_stem_cache_info(cleaner)
+    if stem_cache_info is not None and current_info is not None:
+        stats.stem_cache_hits = current_info.hits - stem_cache_info.hits
+        stats.stem_cache_misses = current_info.misses - stem_cache_info.misses
+
 
+class RankedDocument(object):
+    """
+    Результат ранжирования текста: предложения с оценками PageRank.
+    Порядок по оценке строится лениво и только на нужную длину: уже
+    полученное начало запоминается, поэтому выборка по ratio или words
+    для любого числа вариантов не требует повторной обработки текста,
+    построения графа и полной сортировки.
+    """
+
+    def __init__(self, sentences, length=None):
+        self.sentences = sentences
+        # Число предложений, от которого отсчитывается ratio; по умолчанию - все
+        # ранжированные предложения. Больше их, если ранжировалась только часть текста.
+        self.length = len(sentences) if length is None else length
+        self._ranked = []   # Уже упорядоченное начало ранжирования
+        self._heap = None   # Куча (-оценка, позиция) оставшихся предложений
+
+    def __len__(self):
+        return len(self.sentences)
+
+    @property
+    def ranking(self):
+        """ Все предложения по убыванию оценки, при равных оценках - в исходном порядке. """
+        return self.head(len(self.sentences))
+
+    def head(self, count):
+        """ Первые count предложений ранжирования. """
+        if count > len(self._ranked) and self._heap is None:
+            # Частичный выбор с тем же порядком, что и sorted(..., reverse=True)[:count].
+            positions = heapq.nlargest(count, range(len(self.sentences)), key=lambda i: self.sentences[i].score)
+            self._ranked = [self.sentences[position] for position in positions]
+            self._start_heap(positions)
+        else:
+            for _ in zip(range(count - len(self._ranked)), self._extend()):
+                pass
+        return self._ranked[:count]
+
+    def iter_ranking(self):
+        """ Выдаёт предложения по убыванию оценки; следующее стоит O(log n). """
+        position = 0
+        while position < len(self._ranked) or next(self._extend(), None) is not None:
+            yield self._ranked[position]
+            position += 1
+
+    def _start_heap(self, taken=()):
+        # Куча строится за O(n) из предложений, ещё не попавших в начало ранжирования.
+        taken = set(taken)
+        self._heap = [(-sentence.score, position) for position, sentence in enumerate(self.sentences)
+                      if position not in taken]
+        heapq.heapify(self._heap)
+
+    def _extend(self):
+        """ Переносит из кучи в начало ранжирования следующие предложения по одному. """
+        if self._heap is None:
+            self._start_heap()
+        while self._heap:
+            sentence = self.sentences[heapq.heappop(self._heap)[1]]
+            self._ranked.append(sentence)
+            yield sentence
+
+    def top(self, ratio=0.2, words=None, knapsack=False):
+        """
+        Возвращает наиболее важные предложения в порядке появления в тексте.
+        Если не выбрана опция «слова», количество предложений
+        уменьшается на установленное соотношение, иначе соотношение игнорируется.
+        При knapsack=True бюджет words заполняется оптимально, а не жадно.
+        """
+        if words is None:
+            extracted_sentences = self.head(int(self.length * ratio))
+        elif knapsack:
+            extracted_sentences = _get_sentences_with_word_count_knapsack(self.sentences, words)
+        else:
+            extracted_sentences = _get_sentences_with_word_count(self.iter_ranking(), words)
+
+        # Сортирует извлеченные предложения по порядку появления в исходном тексте.
+        return sorted(extracted_sentences, key=lambda s: s.index)
+
+    def summary(self, ratio=0.2, words=None, split=False, scores=False, knapsack=False):
+        """ Возвращает резюме в том же виде, что и summarize. """
+        # PageRank не может работать в пустом графе.
+        if not self.sentences:
+            return [] if split else ""
 
-def summarize(text, language, ratio=0.2, words=None, split=False, scores=False):
+        return _format_results(self.top(ratio, words, knapsack), split, scores)
+
+
+def rank(text, language, engine="sparse", additional_stopwords=None, cleaner=None, vocabulary=None, stats=None,
+         lsh=None, sparsify=None):
+    """
+    Обрабатывает текст, строит граф предложений и ранжирует его.
+    Возвращает RankedDocument, из которого можно получать резюме разной длины.
+    С lsh=MinHashLSH(...) граф строится приближённо, без перебора всех пар.
+    С sparsify=SimilaritySparsifier(...) в графе остаются только самые тяжёлые рёбра.
+    """
     if not isinstance(text, str):
         raise ValueError("Text parameter must be a Unicode object (str)!")
 
+    # Выбирает реализацию PageRank: "sparse", "scipy" или "python".
+    pagerank = _get_pagerank_engine(engine)
+
+    # Готовый TextCleaner можно передать явно, иначе он берётся из общего кэша.
+    if cleaner is None:
+        cleaner = _get_text_cleaner(language, additional_stopwords)
+
+    # Статистику по этапам можно получить, передав объект SummaryStats.
+    if stats is not None:
+        stem_cache_info = _get_stem_cache_info(cleaner)
+
     # Получает список обработанных предложений.
-    sentences = _clean_text_by_sentences(text, language)
+    # Общий для корпуса словарь можно передать через vocabulary.
+    sentences = cleaner.clean_text_by_sentences(text, vocabulary, stats)
+
+    graph = _build_sentence_graph(sentences, stats, lsh, sparsify)
+
+    if stats is not None:
+        _collect_stats(stats, cleaner, stem_cache_info, sentences, graph)
+
+    return _rank_sentence_graph(sentences, graph, pagerank, stats)
 
+
+def _build_sentence_graph(sentences, stats=None, lsh=None, sparsify=None):
     # Создает граф и рассчитывает коэффициент подобия для каждой пары узлов.
-    graph = _build_graph([sentence.token for sentence in sentences])
-    _set_graph_edge_weights(graph)
+    with _measure(stats, "_set_graph_edge_weights"):
+        graph = _build_graph(_get_sentence_nodes(sentences), _ArrayGraph)
+        _set_graph_edge_weights(graph, sentences, lsh, sparsify)
 
     # Удалите все узлы с весами всех ребер, равными нулю.
-    _remove_unreachable_nodes(graph)
+    with _measure(stats, "remove_unreachable_nodes"):
+        _remove_unreachable_nodes(graph)
 
+    return graph
+
+
+def _rank_sentence_graph(sentences, graph, pagerank, stats=None):
     # PageRank не может работать в пустом графе.
     if len(graph.nodes()) == 0:
-        return [] if split else ""
+        return RankedDocument([])
 
     # Ранжирует токены, используя алгоритм PageRank. Возвращает словарь предложения -> оценок
-    pagerank_scores = _pagerank(graph)
+    with _measure(stats, "_pagerank"):
+        pagerank_scores = pagerank(graph, stats=stats)
 
     # Добавляет итоговые оценки к объектам предложения.
     _add_scores_to_sentences(sentences, pagerank_scores)
 
-    # Извлекает наиболее важные предложения с выбранным критерием.
-    extracted_sentences = _extract_most_important_sentences(sentences, ratio, words)
+    return RankedDocument(sentences)
+
 
-    # Сортирует извлеченные предложения по порядку появления в исходном тексте.
-    extracted_sentences.sort(key=lambda s: s.index)
+def summarize(text, language, ratio=0.2, words=None, split=False, scores=False, engine="sparse",
+              additional_stopwords=None, cleaner=None, vocabulary=None, knapsack=False, stats=None, lsh=None,
+              sparsify=None):
+    document = rank(text, language, engine, additional_stopwords, cleaner, vocabulary, stats, lsh, sparsify)
 
-    return _format_results(extracted_sentences, split, scores)
+    # Извлекает наиболее важные предложения с выбранным критерием.
+    with _measure(stats, "_extract_most_important_sentences"):
+        return document.summary(ratio, words, split, scores, knapsack)
 
 
 def get_graph(text):
@@ -13,6 +13,22 @@ http://snowball.tartarus.org/
 все данные будут на нем(с портала Reddit).
 """
 
+import re
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+STEM_CACHE_SIZE = 100000
+
+StemCacheInfo = namedtuple("StemCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+def _suffix_table(suffixes):
+    """
+     Индексирует кортеж окончаний: окончание -> позиция в кортеже
+     и отсортированный список встречающихся длин окончаний.
+    """
+    return {suffix: i for i, suffix in enumerate(suffixes)}, sorted({len(suffix) for suffix in suffixes})
+
 
 class SnowballStemmer:
     languages = (
@@ -28,6 +44,72 @@ class SnowballStemmer:
         self.stem = self.stemmer.stem
 
 
+class CachedStemmer:
+    """
+     Мемоизирующая обёртка над стеммером с ограниченным LRU-кэшем.
+     Текст на естественном языке подчиняется закону Ципфа, поэтому
+     большинство слов уже встречалось раньше и берётся из кэша.
+     Один экземпляр можно использовать из нескольких потоков.
+    """
+
+    def __init__(self, language, maxsize=STEM_CACHE_SIZE):
+        self.language = language
+        self.stemmer = SnowballStemmer(language)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def stem(self, word):
+        with self._lock:
+            if word in self._cache:
+                self._cache.move_to_end(word)
+                self.hits += 1
+                return self._cache[word]
+
+        stem = self.stemmer.stem(word)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[word] = stem
+            if self.maxsize is not None and len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+        return stem
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def cache_info(self):
+        with self._lock:
+            return StemCacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_CACHED_STEMMERS = {}
+_CACHED_STEMMERS_LOCK = Lock()
+
+
+def get_cached_stemmer(language):
+    """
+     Возвращает общий для процесса CachedStemmer для языка,
+     чтобы кэш основ переиспользовался между документами.
+    """
+    with _CACHED_STEMMERS_LOCK:
+        if language not in _CACHED_STEMMERS:
+            _CACHED_STEMMERS[language] = CachedStemmer(language)
+        return _CACHED_STEMMERS[language]
+
+
 class _LanguageSpecificStemmer:
     """
      Это вспомогательный подкласс предлагает возможность
@@ -732,6 +814,47 @@ class RussianStemmer(_LanguageSpecificStemmer):
     __superlative_suffixes = ("ei`she", "ei`sh")
     __derivational_suffixes = ("ost'", "ost")
 
+    __perfective_gerund_table = _suffix_table(__perfective_gerund_suffixes)
+    __adjectival_table = _suffix_table(__adjectival_suffixes)
+    __reflexive_table = _suffix_table(__reflexive_suffixes)
+    __verb_table = _suffix_table(__verb_suffixes)
+    __noun_table = _suffix_table(__noun_suffixes)
+
+    # Таблицы транслитерации строятся один раз, а не цепочкой str.replace на каждое слово.
+    __cyrillic_to_roman_table = str.maketrans({
+        "\u0410": "a", "\u0430": "a", "\u0411": "b", "\u0431": "b",
+        "\u0412": "v", "\u0432": "v", "\u0413": "g", "\u0433": "g",
+        "\u0414": "d", "\u0434": "d", "\u0415": "e", "\u0435": "e",
+        "\u0401": "e", "\u0451": "e", "\u0416": "zh", "\u0436": "zh",
+        "\u0417": "z", "\u0437": "z", "\u0418": "i", "\u0438": "i",
+        "\u0419": "i`", "\u0439": "i`", "\u041A": "k", "\u043A": "k",
+        "\u041B": "l", "\u043B": "l", "\u041C": "m", "\u043C": "m",
+        "\u041D": "n", "\u043D": "n", "\u041E": "o", "\u043E": "o",
+        "\u041F": "p", "\u043F": "p", "\u0420": "r", "\u0440": "r",
+        "\u0421": "s", "\u0441": "s", "\u0422": "t", "\u0442": "t",
+        "\u0423": "u", "\u0443": "u", "\u0424": "f", "\u0444": "f",
+        "\u0425": "kh", "\u0445": "kh", "\u0426": "t^s", "\u0446": "t^s",
+        "\u0427": "ch", "\u0447": "ch", "\u0428": "sh", "\u0448": "sh",
+        "\u0429": "shch", "\u0449": "shch", "\u042A": "''", "\u044A": "''",
+        "\u042B": "y", "\u044B": "y", "\u042C": "'", "\u044C": "'",
+        "\u042D": "e`", "\u044D": "e`", "\u042E": "i^u", "\u044E": "i^u",
+        "\u042F": "i^a", "\u044F": "i^a",
+    })
+    __roman_to_cyrillic_map = {
+        "i^u": "\u044E", "i^a": "\u044F", "shch": "\u0449", "kh": "\u0445",
+        "t^s": "\u0446", "ch": "\u0447", "e`": "\u044D", "i`": "\u0439",
+        "sh": "\u0448", "zh": "\u0436", "''": "\u044A",
+        "a": "\u0430", "b": "\u0431", "v": "\u0432", "g": "\u0433",
+        "d": "\u0434", "e": "\u0435", "z": "\u0437", "i": "\u0438",
+        "k": "\u043A", "l": "\u043B", "m": "\u043C", "n": "\u043D",
+        "o": "\u043E", "p": "\u043F", "r": "\u0440", "s": "\u0441",
+        "t": "\u0442", "u": "\u0443", "f": "\u0444", "y": "\u044B",
+        "'": "\u044C",
+    }
+    # Многобуквенные сочетания стоят раньше одиночных букв, как в цепочке замен.
+    __roman_to_cyrillic_pattern = re.compile("|".join(re.escape(key) for key in __roman_to_cyrillic_map))
+    __cyrillic_word_pattern = re.compile("[\u0410-\u044F\u0401\u0451]+")
+
     def stem(self, word):
         """
         Stem a Russian word and return the stemmed form.
@@ -740,11 +863,8 @@ class RussianStemmer(_LanguageSpecificStemmer):
         :return: The stemmed form.
         :rtype: unicode
         """
-        chr_exceeded = False
-        for i in range(len(word)):
-            if ord(word[i]) > 255:
-                chr_exceeded = True
-                break
+        chr_exceeded = bool(word) and max(word) > "\xff"
+        cyrillic_only = chr_exceeded and self.__cyrillic_word_pattern.fullmatch(word) is not None
 
         if chr_exceeded:
             word = self.__cyrillic_to_roman(word)
@@ -758,7 +878,7 @@ class RussianStemmer(_LanguageSpecificStemmer):
         rv, r2 = self.__regions_russian(word)
 
         # Step 1
-        for suffix in self.__perfective_gerund_suffixes:
+        for suffix in self.__matching_suffixes(rv, self.__perfective_gerund_table):
             if rv.endswith(suffix):
                 if suffix in ("v", "vshi", "vshis'"):
                     if (rv[-len(suffix) - 3:-len(suffix)] == "i^a" or
@@ -776,14 +896,14 @@ class RussianStemmer(_LanguageSpecificStemmer):
                     break
 
         if not step1_success:
-            for suffix in self.__reflexive_suffixes:
+            for suffix in self.__matching_suffixes(rv, self.__reflexive_table):
                 if rv.endswith(suffix):
                     word = word[:-len(suffix)]
                     r2 = r2[:-len(suffix)]
                     rv = rv[:-len(suffix)]
                     break
 
-            for suffix in self.__adjectival_suffixes:
+            for suffix in self.__matching_suffixes(rv, self.__adjectival_table):
                 if rv.endswith(suffix):
                     if suffix in ('i^ushchi^ui^u', 'i^ushchi^ai^a',
                                   'i^ushchui^u', 'i^ushchai^a', 'i^ushchoi^u',
@@ -835,7 +955,7 @@ class RussianStemmer(_LanguageSpecificStemmer):
                         break
 
             if not adjectival_removed:
-                for suffix in self.__verb_suffixes:
+                for suffix in self.__matching_suffixes(rv, self.__verb_table):
                     if rv.endswith(suffix):
                         if suffix in ("la", "na", "ete", "i`te", "li",
                                       "i`", "l", "em", "n", "lo", "no",
@@ -856,7 +976,7 @@ class RussianStemmer(_LanguageSpecificStemmer):
                             break
 
             if not adjectival_removed and not verb_removed:
-                for suffix in self.__noun_suffixes:
+                for suffix in self.__matching_suffixes(rv, self.__noun_table):
                     if rv.endswith(suffix):
                         word = word[:-len(suffix)]
                         r2 = r2[:-len(suffix)]
@@ -892,11 +1012,32 @@ class RussianStemmer(_LanguageSpecificStemmer):
             if word.endswith("'"):
                 word = word[:-1]
 
-        if chr_exceeded:
+        if cyrillic_only:
+            # Слово из одной кириллицы: обратная транслитерация за один проход.
+            word = self.__roman_to_cyrillic_pattern.sub(self.__replace_roman_unit, word)
+        elif chr_exceeded:
+            # В смешанных словах латиница тоже переводится в кириллицу прежней цепочкой замен.
             word = self.__roman_to_cyrillic(word)
 
         return word
 
+    @classmethod
+    def __replace_roman_unit(cls, match):
+        return cls.__roman_to_cyrillic_map[match.group()]
+
+    @staticmethod
+    def __matching_suffixes(rv, table):
+        """
+        Return the suffixes from a suffix table that rv ends with,
+        in the order they appear in the table.
+        Only one dictionary lookup per distinct suffix length is needed
+        instead of calling endswith for every suffix.
+        """
+        index, lengths = table
+        matches = [rv[-length:] for length in lengths if length <= len(rv) and rv[-length:] in index]
+        matches.sort(key=index.__getitem__)
+        return matches
+
     @staticmethod
     def __regions_russian(word):
         """
@@ -961,41 +1102,7 @@ class RussianStemmer(_LanguageSpecificStemmer):
         :note: This helper method is invoked by the stem method of the subclass
                RussianStemmer. It is not to be invoked directly!
         """
-        word = (word.replace("\u0410", "a").replace("\u0430", "a")
-                .replace("\u0411", "b").replace("\u0431", "b")
-                .replace("\u0412", "v").replace("\u0432", "v")
-                .replace("\u0413", "g").replace("\u0433", "g")
-                .replace("\u0414", "d").replace("\u0434", "d")
-                .replace("\u0415", "e").replace("\u0435", "e")
-                .replace("\u0401", "e").replace("\u0451", "e")
-                .replace("\u0416", "zh").replace("\u0436", "zh")
-                .replace("\u0417", "z").replace("\u0437", "z")
-                .replace("\u0418", "i").replace("\u0438", "i")
-                .replace("\u0419", "i`").replace("\u0439", "i`")
-                .replace("\u041A", "k").replace("\u043A", "k")
-                .replace("\u041B", "l").replace("\u043B", "l")
-                .replace("\u041C", "m").replace("\u043C", "m")
-                .replace("\u041D", "n").replace("\u043D", "n")
-                .replace("\u041E", "o").replace("\u043E", "o")
-                .replace("\u041F", "p").replace("\u043F", "p")
-                .replace("\u0420", "r").replace("\u0440", "r")
-                .replace("\u0421", "s").replace("\u0441", "s")
-                .replace("\u0422", "t").replace("\u0442", "t")
-                .replace("\u0423", "u").replace("\u0443", "u")
-                .replace("\u0424", "f").replace("\u0444", "f")
-                .replace("\u0425", "kh").replace("\u0445", "kh")
-                .replace("\u0426", "t^s").replace("\u0446", "t^s")
-                .replace("\u0427", "ch").replace("\u0447", "ch")
-                .replace("\u0428", "sh").replace("\u0448", "sh")
-                .replace("\u0429", "shch").replace("\u0449", "shch")
-                .replace("\u042A", "''").replace("\u044A", "''")
-                .replace("\u042B", "y").replace("\u044B", "y")
-                .replace("\u042C", "'").replace("\u044C", "'")
-                .replace("\u042D", "e`").replace("\u044D", "e`")
-                .replace("\u042E", "i^u").replace("\u044E", "i^u")
-                .replace("\u042F", "i^a").replace("\u044F", "i^a"))
-
-        return word
+        return word.translate(RussianStemmer.__cyrillic_to_roman_table)
 
     @staticmethod
     def __roman_to_cyrillic(word):
@@ -2,8 +2,13 @@ import string
 import unicodedata
 import logging
 import re
-from .SnowBall import SnowballStemmer
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from threading import Lock
+from .SnowBall import SnowballStemmer, get_cached_stemmer
 from .StopWords import get_stopwords_by_language
+from .Vocabulary import Vocabulary
+from ..Stats import measure
 
 logger = logging.getLogger('summa.preprocessing.cleaner')
 
@@ -34,23 +39,23 @@ AB_ACRONYM_LETTERS = re.compile("([a-zA-Z])\.([a-zA-Z])\.")
 UNDO_AB_SENIOR = re.compile("([A-Z][a-z]{1,2}\.)" + SEPARATOR + "(\w)")
 UNDO_AB_ACRONYM = re.compile("(\.[a-zA-Z]\.)" + SEPARATOR + "(\w)")
 
+TEXT_CLEANER_CACHE_SIZE = 32
+SENTENCE_CACHE_SIZE = 20000
+
+SentenceCacheInfo = namedtuple("SentenceCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
 STEMMER = None
 STOPWORDS = None
 
 
 def set_stemmer_language(language):
     global STEMMER
-    if not language in SnowballStemmer.languages:
-        raise ValueError("Valid languages are: " + ", ".join(sorted(SnowballStemmer.languages)))
-    STEMMER = SnowballStemmer(language)
+    STEMMER = get_text_cleaner(language).stemmer
 
 
 def set_stopwords_by_language(language, additional_stopwords):
     global STOPWORDS
-    words = get_stopwords_by_language(language)
-    if not additional_stopwords:
-        additional_stopwords = {}
-    STOPWORDS = frozenset({w for w in words.split() if w} | {w for w in additional_stopwords if w})
+    STOPWORDS = get_text_cleaner(language, additional_stopwords).stopwords
 
 
 def init_textcleanner(language, additional_stopwords):
@@ -58,6 +63,17 @@ def init_textcleanner(language, additional_stopwords):
     set_stopwords_by_language(language, additional_stopwords)
 
 
+def get_text_cleaner(language, additional_stopwords=None):
+    """ Возвращает TextCleaner для языка и набора стоп-слов из общего кэша.
+     Объект создаётся один раз на каждую пару (язык, дополнительные стоп-слова). """
+    return _get_cached_text_cleaner(language, frozenset(w for w in additional_stopwords or () if w))
+
+
+@lru_cache(maxsize=TEXT_CLEANER_CACHE_SIZE)
+def _get_cached_text_cleaner(language, additional_stopwords):
+    return TextCleaner(language, additional_stopwords)
+
+
 def split_sentences(text):
     processed = replace_abbreviations(text)
     return [undo_replacement(sentence) for sentence in get_sentences(processed)]
@@ -100,6 +116,11 @@ def strip_numeric(s):
     return RE_NUMERIC.sub("", s)
 
 
+# Совмещает strip_numeric и strip_punctuation в один вызов str.translate:
+# цифры удаляются, знаки пунктуации заменяются пробелами.
+TOKEN_TRANSLATION = str.maketrans(string.punctuation, " " * len(string.punctuation), string.digits)
+
+
 def remove_stopwords(sentence):
     return " ".join(w for w in sentence.split() if w not in STOPWORDS)
 
@@ -133,7 +154,8 @@ def deaccent(text):
 
 
 # Взято из Gensim
-PAT_ALPHABETIC = re.compile('(((?![\d])\w)+)', re.UNICODE)
+# Буквенные последовательности: символы слова, кроме цифр.
+PAT_ALPHABETIC = re.compile(r'[^\W\d]+', re.UNICODE)
 
 
 def tokenize(text, lowercase=False, deacc=False):
@@ -145,20 +167,25 @@ def tokenize(text, lowercase=False, deacc=False):
         text = text.lower()
     if deacc:
         text = deaccent(text)
-    for match in PAT_ALPHABETIC.finditer(text):
-        yield match.group()
+    yield from PAT_ALPHABETIC.findall(text)
 
 
 def merge_syntactic_units(original_units, filtered_units, tags=None):
     units = []
     for i in range(len(original_units)):
-        if filtered_units[i] == '':
+        token = filtered_units[i]
+        tokens = None
+        if isinstance(token, list):
+            # Список основ; пропускается, если его строка пуста.
+            tokens, token = token, None
+            if tokens in ([], [""]):
+                continue
+        elif token == '':
             continue
 
         text = original_units[i]
-        token = filtered_units[i]
         tag = tags[i][1] if tags else None
-        sentence = SyntacticUnit(text, token, tag)
+        sentence = SyntacticUnit(text, token, tag, tokens)
         sentence.index = i
 
         units.append(sentence)
@@ -166,29 +193,16 @@ def merge_syntactic_units(original_units, filtered_units, tags=None):
     return units
 
 
-def clean_text_by_sentences(text, language, additional_stopwords=None):
+def clean_text_by_sentences(text, language, additional_stopwords=None, vocabulary=None):
     """ Разбивает данный текст на предложения, применяя фильтры и их лемматизируя.
      Возвращает список SyntacticUnit. """
-    init_textcleanner(language, additional_stopwords)
-    original_sentences = split_sentences(text)
-    filtered_sentences = filter_words(original_sentences)
-
-    return merge_syntactic_units(original_sentences, filtered_sentences)
+    return get_text_cleaner(language, additional_stopwords).clean_text_by_sentences(text, vocabulary)
 
 
 def clean_text_by_word(text, language, deacc=False, additional_stopwords=None):
     """ Разбивает данный текст на слова, применяя фильтры и их лемматизируя.
      Возвращает слово слова -> syntacticUnit. """
-    init_textcleanner(language, additional_stopwords)
-    text_without_acronyms = replace_with_separator(text, "", [AB_ACRONYM_LETTERS])
-    original_words = list(tokenize(text_without_acronyms, lowercase=True, deacc=deacc))
-    filtered_words = filter_words(original_words)
-    if HAS_PATTERN:
-        tags = tag(" ".join(original_words))  # тегу нужен контекст слов в тексте
-    else:
-        tags = None
-    units = merge_syntactic_units(original_words, filtered_words, tags)
-    return {unit.text: unit for unit in units}
+    return get_text_cleaner(language, additional_stopwords).clean_text_by_word(text, deacc)
 
 
 def tokenize_by_word(text, deacc=False):
@@ -196,14 +210,220 @@ def tokenize_by_word(text, deacc=False):
     return tokenize(text_without_acronyms, lowercase=True, deacc=deacc)
 
 
+class TextCleaner(object):
+    """
+    Стеммер и стоп-слова для одного языка.
+    Объект не меняется после создания, поэтому один экземпляр можно
+    использовать сразу из нескольких потоков и для разных документов.
+    """
+
+    def __init__(self, language, additional_stopwords=None, stemmer=None):
+        if not language in SnowballStemmer.languages:
+            raise ValueError("Valid languages are: " + ", ".join(sorted(SnowballStemmer.languages)))
+        words = get_stopwords_by_language(language)
+        if not additional_stopwords:
+            additional_stopwords = {}
+
+        self.language = language
+        # По умолчанию используется общий для языка стеммер с кэшем основ.
+        self.stemmer = stemmer if stemmer is not None else get_cached_stemmer(language)
+        self.stopwords = frozenset({w for w in words.split() if w} | {w for w in additional_stopwords if w})
+
+    def remove_stopwords(self, sentence):
+        return " ".join(w for w in sentence.split() if w not in self.stopwords)
+
+    def stem_sentence(self, sentence):
+        word_stems = [self.stemmer.stem(word) for word in sentence.split()]
+        return " ".join(word_stems)
+
+    def tokenize_sentence(self, sentence):
+        """ Переводит предложение в список основ слов без стоп-слов за один проход.
+         Результат совпадает с filter_words, разбитым по пробелам. """
+        stem = self.stemmer.stem
+        stopwords = self.stopwords
+        return [stem(w) for w in sentence.lower().translate(TOKEN_TRANSLATION).split() if w not in stopwords]
+
+    def tokenize_sentences(self, sentences):
+        return [self.tokenize_sentence(sentence) for sentence in sentences]
+
+    def filter_words(self, sentences):
+        return [" ".join(tokens) for tokens in self.tokenize_sentences(sentences)]
+
+    def clean_text_by_sentences(self, text, vocabulary=None, stats=None):
+        """ Разбивает текст на предложения и переводит их основы в идентификаторы.
+         Без общего словаря корпуса для документа создаётся свой Vocabulary. """
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+
+        with measure(stats, "split_sentences"):
+            original_sentences = split_sentences(text)
+        with measure(stats, "filter_words"):
+            filtered_sentences = self.tokenize_sentences(original_sentences)
+
+            units = merge_syntactic_units(original_sentences, filtered_sentences)
+            for unit in units:
+                unit.set_vocabulary(vocabulary)
+        return units
+
+    def clean_text_by_word(self, text, deacc=False):
+        return self.clean_words(list(tokenize_by_word(text, deacc)))
+
+    def clean_text_by_sentences_and_words(self, text, vocabulary=None, stats=None):
+        """ Совмещает clean_text_by_sentences и clean_text_by_word: текст делится
+         на предложения, приводится к нижнему регистру и стеммируется один раз.
+         Слова для графа ключевых слов берутся из тех же предложений.
+         Возвращает (список SyntacticUnit предложений, слова текста по порядку,
+         словарь слово -> SyntacticUnit). """
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+
+        with measure(stats, "split_sentences"):
+            original_sentences = split_sentences(text)
+
+        with measure(stats, "filter_words"):
+            stem = self.stemmer.stem
+            stopwords = self.stopwords
+            stems = {}  # Слово -> основа, для слов, не являющихся стоп-словами
+            filtered_sentences = []
+            split_text = []
+            for sentence in original_sentences:
+                lowered = sentence.lower()
+                tokens = []
+                for word in lowered.translate(TOKEN_TRANSLATION).split():
+                    if word in stopwords:
+                        continue
+                    word_stem = stems.get(word)
+                    if word_stem is None:
+                        word_stem = stems[word] = stem(word)
+                    tokens.append(word_stem)
+                filtered_sentences.append(tokens)
+                split_text.extend(tokenize(replace_with_separator(lowered, "", [AB_ACRONYM_LETTERS])))
+
+            units = merge_syntactic_units(original_sentences, filtered_sentences)
+            for unit in units:
+                unit.set_vocabulary(vocabulary)
+
+        with measure(stats, "clean_words"):
+            words = self.clean_words(split_text, stems)
+        return units, split_text, words
+
+    def clean_words(self, original_words, stems=None):
+        """ То же, что clean_text_by_word, для уже разбитого tokenize_by_word текста.
+         Позволяет не разбирать текст повторно, если список слов нужен и сам по себе.
+         stems - уже известные основы слов, не являющихся стоп-словами. """
+        if HAS_PATTERN:
+            tags = tag(" ".join(original_words))  # тегу нужен контекст слов в тексте
+        else:
+            tags = None
+
+        # В словаре остаётся последнее вхождение каждого слова, поэтому
+        # основы считаются один раз на слово, а не на каждое вхождение.
+        last_positions = {word: i for i, word in enumerate(original_words)}
+        units = {}
+        for word, i in last_positions.items():
+            if stems is not None and word in stems:
+                tokens = [stems[word]]
+            else:
+                tokens = self.tokenize_sentence(word)
+            if tokens in ([], [""]):
+                continue
+            unit = SyntacticUnit(word, None, tags[i][1] if tags else None, tokens)
+            unit.index = i
+            units[word] = unit
+        return units
+
+
+class CachedTextCleaner(TextCleaner):
+    """
+    TextCleaner, запоминающий основы уже обработанных предложений.
+    При повторной обработке изменённого текста заново разбираются и
+    стеммируются только новые или отредактированные предложения.
+    """
+
+    def __init__(self, language, additional_stopwords=None, stemmer=None, maxsize=SENTENCE_CACHE_SIZE):
+        super().__init__(language, additional_stopwords, stemmer)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def tokenize_sentence(self, sentence):
+        with self._lock:
+            tokens = self._cache.get(sentence)
+            if tokens is not None:
+                self._cache.move_to_end(sentence)
+                self.hits += 1
+                return tokens
+            self.misses += 1
+
+        tokens = super().tokenize_sentence(sentence)
+        with self._lock:
+            self._cache[sentence] = tokens
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def cache_info(self):
+        with self._lock:
+            return SentenceCacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class SyntacticUnit(object):
 
-    def __init__(self, text, token=None, tag=None):
+    def __init__(self, text, token=None, tag=None, tokens=None):
         self.text = text
-        self.token = token
+        self._tokens = tokens  # Список основ слов, если он известен
+        self._token = token
+        self.ids = None  # array('I') идентификаторов основ в self.vocabulary
+        self.vocabulary = None
         self.tag = tag[:2] if tag else None  # только первые две буквы тега
         self.index = -1
         self.score = -1
+        self._word_count = None
+
+    @property
+    def word_count(self):
+        # Число слов исходного текста считается один раз.
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    @property
+    def tokens(self):
+        if self._tokens is None and self.ids is not None:
+            return self.vocabulary.decode(self.ids)
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, value):
+        self._tokens = value
+
+    def set_vocabulary(self, vocabulary):
+        """ Переводит основы в идентификаторы словаря. Список основ после этого
+         не хранится и восстанавливается из словаря по требованию. """
+        self.ids = vocabulary.encode(self.tokens)
+        self.vocabulary = vocabulary
+        # Строка основ тоже восстанавливается по требованию: узлы графа - позиции предложений.
+        self._tokens = None
+        self._token = None
+
+    @property
+    def token(self):
+        # Строка основ через пробел собирается только при первом обращении.
+        if self._token is None and self.tokens is not None:
+            self._token = " ".join(self.tokens)
+        return self._token
+
+    @token.setter
+    def token(self, value):
+        self._token = value
 
     def __str__(self):
         return "Original unit: '" + self.text + "' *-*-*-* " + "Processed unit: '" + self.token + "'"
@@ -0,0 +1,51 @@
+from array import array
+from threading import Lock
+
+
+class Vocabulary(object):
+    """
+    Словарь основ слов: каждой основе сопоставляется плотный целочисленный
+    идентификатор. Обычно создаётся на один документ, но может быть общим
+    для корпуса и использоваться из нескольких потоков.
+    """
+
+    def __init__(self):
+        self._ids = {}  # Основа -> идентификатор
+        self._words = []  # Идентификатор -> основа
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._ids
+
+    def get_id(self, word):
+        """Возвращает идентификатор основы или None, если её нет в словаре."""
+        return self._ids.get(word)
+
+    def get_word(self, word_id):
+        return self._words[word_id]
+
+    def encode(self, words):
+        """
+        Переводит список основ в компактный массив идентификаторов,
+        добавляя в словарь новые основы.
+        @type  words: list
+        @param words: Список основ слов.
+        @rtype:  array
+        @return: Массив array('I') идентификаторов.
+        """
+        result = array('I')
+        with self._lock:
+            for word in words:
+                word_id = self._ids.get(word)
+                if word_id is None:
+                    word_id = len(self._words)
+                    self._ids[word] = word_id
+                    self._words.append(word)
+                result.append(word_id)
+        return result
+
+    def decode(self, ids):
+        return [self._words[word_id] for word_id in ids]